@@ -26,7 +26,18 @@ class TaskAdmin(admin.ModelAdmin):
     list_filter = ('project', 'milestone', 'priority', 'status')
     # Add project and milestone fields to the detail view fields list:
     fields = ('project', 'milestone', 'title', 'description', 'start_date', 'due_date', 'priority', 'status', 'prerequisite_tasks', 'tags')
-    
+
+    # Milestone and Tag option labels print the project title, so load it with the choices.
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'milestone':
+            kwargs['queryset'] = Milestone.objects.select_related('project')
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def formfield_for_manytomany(self, db_field, request, **kwargs):
+        if db_field.name == 'tags':
+            kwargs['queryset'] = Tag.objects.select_related('project')
+        return super().formfield_for_manytomany(db_field, request, **kwargs)
+
 @admin.register(Milestone)
 class MilestoneAdmin(admin.ModelAdmin):
     list_display = ['name', 'project', 'due_date', 'milestone_type', 'is_complete']
@@ -46,6 +57,10 @@ class MilestoneAdmin(admin.ModelAdmin):
     
     inlines = [TaskInline]
 
+    def get_queryset(self, request):
+        # is_complete in list_display reads the annotation instead of querying per row
+        return super().get_queryset(request).with_open_tasks()
+
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
     list_display = ('name', 'project')
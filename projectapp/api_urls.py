@@ -7,4 +7,7 @@ router.register(r'tasks', TaskViewSet, basename='api-tasks')
 router.register(r'tags', TagViewSet, basename='api-tags')
 router.register(r'milestones', MilestoneViewSet, basename='api-milestones')
 
-urlpatterns = router.urls
+__all__ = ('urlpatterns',)
+
+# Materialize the generated routes once at import time.
+urlpatterns = list(router.urls)
@@ -1,10 +1,10 @@
 from rest_framework import viewsets, permissions, status
-from django.db.models import Count, Max
+from django.db.models import Max, OuterRef, Prefetch, Subquery
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from .models import Project, Task, Tag, Milestone
-from .serializers import ProjectSerializer, TaskSerializer, TagSerializer, MilestoneSerializer, ProjectListSerializer, TagDetailSerializer
+from .serializers import ProjectSerializer, TaskSerializer, TagSerializer, MilestoneSerializer, TagDetailSerializer, PROJECT_LIST_VALUES, serialize_project_list
 
 
 class ProjectViewSet(viewsets.ModelViewSet):
@@ -17,33 +17,45 @@ class ProjectViewSet(viewsets.ModelViewSet):
         queryset = Project.objects.all()
 
         if self.action == "list":
-            # Annotate counts and latest due date
-            queryset = queryset.annotate(
-                task_count=Count("tasks", distinct=True),
-                milestone_count=Count("milestones", distinct=True),
-                latest_due_date=Max("tasks__due_date"),
+            # Annotate counts, progress inputs and latest due date.
+            # Each aggregate is a correlated subquery, so tasks and milestones
+            # are never joined together (no tasks x milestones row fan-out).
+            # with_progress() also provides task_count and milestone_count.
+            project_tasks = Task.objects.filter(project=OuterRef("pk")).order_by().values("project")
+            # list() reads .values() rows, which select only the listed columns.
+            queryset = queryset.with_progress().annotate(
+                latest_due_date=Subquery(project_tasks.annotate(m=Max("due_date")).values("m")),
             )
         else:
-            queryset = queryset.prefetch_related(
-                "tasks",
-                "tasks__tags",
-                "milestones",
-                "tags",
-            )
+            queryset = ProjectSerializer.setup_eager_loading(queryset)
 
         return queryset
 
     def get_serializer_class(self):
-        if self.action == "list":
-            return ProjectListSerializer
         return ProjectSerializer
 
+    def list(self, request, *args, **kwargs):
+        # List rows are plain dicts: no model instances or serializer fields
+        rows = self.filter_queryset(self.get_queryset()).values(*PROJECT_LIST_VALUES)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serialize_project_list(page, request))
+        return Response(serialize_project_list(rows, request))
+
 class TaskViewSet(viewsets.ModelViewSet):
     queryset = (
         Task.objects
-        .select_related('project')                 
-        .prefetch_related('prerequisite_tasks')    
-        .prefetch_related('tags')
+        .select_related('project', 'milestone')
+        # Prerequisites are rendered as ids and titles only (validate() on
+        # updates also reads project_id)
+        .prefetch_related(Prefetch('prerequisite_tasks', queryset=Task.objects.only(
+            'id', 'title', 'project_id',
+        )))
+        # Nested TagSerializer prints each tag's project title
+        .prefetch_related(Prefetch('tags', queryset=Tag.objects.select_related('project').only(
+            'id', 'name', 'project', 'project__title',
+        )))
         .all()
     )
     serializer_class = TaskSerializer
@@ -53,13 +65,21 @@ class TaskViewSet(viewsets.ModelViewSet):
     ]
     
 class MilestoneViewSet(viewsets.ModelViewSet):
-    queryset = Milestone.objects.select_related('project').prefetch_related('tasks').all()
+    queryset = (
+        Milestone.objects.select_related('project')
+        # Nested tasks render through SimpleTaskSerializer; milestone_id joins them back
+        .prefetch_related(Prefetch('tasks', queryset=Task.objects.only(
+            'id', 'milestone_id', 'title', 'status', 'due_date',
+        )))
+        .with_open_tasks()
+    )
     serializer_class = MilestoneSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly,permissions.DjangoModelPermissions]
 
 
 class TagViewSet(viewsets.ModelViewSet):
-    queryset = Tag.objects.select_related('project').all()
+    # TagSerializer reads the project's title only
+    queryset = Tag.objects.select_related('project').only('id', 'name', 'project', 'project__title')
     #serializer_class = TagSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly,permissions.DjangoModelPermissions]
     
@@ -68,7 +88,9 @@ class TagViewSet(viewsets.ModelViewSet):
 
         # Only optimize the detail view
         if self.action == 'retrieve':
-            queryset = queryset.prefetch_related('tasks')
+            queryset = queryset.prefetch_related(Prefetch('tasks', queryset=Task.objects.only(
+                'id', 'title', 'status', 'due_date',
+            )))
 
         return queryset
 
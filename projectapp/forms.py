@@ -1,7 +1,7 @@
 from django import forms
 from django.core.exceptions import ValidationError
-from django.db.models import Max, Q
-from django.db import transaction
+from django.db.models import BigIntegerField, Case, Max, Q, Value, When
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from .models import Project, Task, Tag, Milestone
 
@@ -22,32 +22,73 @@ class TagForm(forms.ModelForm):
         
         if self.project is None:
             raise ValueError("TagForm requires a 'project' instance.")
-        
+        self.instance.project = self.project
+
+    def _duplicate_name_error(self, name):
+        return ValidationError(f"A tag named '{name}' already exists in this project.")
+
     def clean_name(self):
-        """
-        Validates tag name uniqueness within the project 
-        to prevent IntegrityError (500 error) on duplicate submission.
-        """
+        # 'project' is not a form field, so model validation skips the
+        # tag_name_ci_uniq constraint; check it here instead
         name = self.cleaned_data['name']
-        
-        # Check for duplicates, excluding the current instance if we are editing
-        qs = Tag.objects.filter(name__iexact=name, project=self.project)
+        duplicates = Tag.objects.filter(project=self.project, name__iexact=name)
         if self.instance.pk:
-            qs = qs.exclude(pk=self.instance.pk)
-            
-        if qs.exists():
-            raise ValidationError(f"A tag named '{name}' already exists in this project.")
-            
-        return name 
+            duplicates = duplicates.exclude(pk=self.instance.pk)
+        if duplicates.exists():
+            raise self._duplicate_name_error(name)
+        return name
     
     def save(self, commit=True):            
         tag_instance = super().save(commit=False)            
-        tag_instance.project = self.project            
         if commit:
-            tag_instance.save()                
+            # A concurrent request may take the name after clean_name(): the
+            # constraint rejects the row, the error is added to the form and
+            # the tag comes back unsaved (pk is None).
+            try:
+                with transaction.atomic():
+                    tag_instance.save()
+            except IntegrityError:
+                tag_instance.pk = None
+                self.add_error('name', self._duplicate_name_error(tag_instance.name))
         return tag_instance
 
 
+class PKOnlyMultipleChoiceField(forms.ModelMultipleChoiceField):
+    """
+    A ModelMultipleChoiceField that cleans to a tuple of primary keys.
+
+    Submitted ids are validated with a values_list() query, so no model
+    instances are built when the caller only needs the ids (e.g. for
+    a related manager's set()).
+    """
+
+    def clean(self, value):
+        value = self.prepare_value(value)
+        if not value:
+            if self.required:
+                raise ValidationError(self.error_messages['required'], code='required')
+            return ()
+        if not isinstance(value, (list, tuple)):
+            raise ValidationError(self.error_messages['invalid_list'], code='invalid_list')
+
+        pk_field = self.queryset.model._meta.pk
+        try:
+            pks = tuple(dict.fromkeys(pk_field.to_python(v) for v in value))
+        except ValidationError:
+            raise ValidationError(self.error_messages['invalid_list'], code='invalid_list')
+
+        found = set(self.queryset.filter(pk__in=pks).values_list('pk', flat=True))
+        for pk in pks:
+            if pk not in found:
+                raise ValidationError(
+                    self.error_messages['invalid_choice'],
+                    code='invalid_choice',
+                    params={'value': pk},
+                )
+        self.run_validators(value)
+        return pks
+
+
 class TaskForm(forms.ModelForm):
     new_tags = forms.CharField(
         widget=forms.TextInput(attrs={'placeholder': 'Add new tags (comma-separated)'}),
@@ -73,13 +114,17 @@ class TaskForm(forms.ModelForm):
             'tags',
             'prerequisite_tasks',
         ] 
+        field_classes = {
+            # Only ids are needed downstream, so skip building Task instances
+            'prerequisite_tasks': PKOnlyMultipleChoiceField,
+        }
         labels = {
             'title': 'Task Title', 
             'status': 'Completion Status',
         }
 
+        # priority renders as a Select from the model field's choices
         widgets = {
-            'priority': forms.Select(choices=Task.PRIORITY_CHOICES),
             'start_date': forms.DateInput(attrs={'type': 'date'}), 
             'due_date': forms.DateInput(attrs={'type': 'date'}), 
         }
@@ -90,11 +135,14 @@ class TaskForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
                 
         if self.project:
+            # Related managers attach self.project to every row, so option
+            # labels that print the project title need no extra query.
             self.fields['tags'].queryset = self.project.tags.all()
-            self.fields['milestone'].queryset = Milestone.objects.filter(project=self.project)
+            self.fields['milestone'].queryset = self.project.milestones.all()
             self.fields['prerequisite_tasks'].queryset = (
-                Task.objects.filter(project=self.project)
-                .exclude(id=self.instance.id)
+                self.project.tasks.exclude(id=self.instance.id)
+                # Columns used by the option label and by Task.__init__
+                .only('id', 'project_id', 'milestone_id', 'title', 'due_date')
                 .order_by('due_date')
             )
         else:
@@ -109,7 +157,8 @@ class TaskForm(forms.ModelForm):
             
     def clean(self):
         cleaned_data = super().clean()
-        prerequisites = cleaned_data.get('prerequisite_tasks', [])
+        # Tuple of prerequisite ids (empty if none were selected)
+        prerequisites = cleaned_data.get('prerequisite_tasks')
         start_date = cleaned_data.get('start_date')
         due_date = cleaned_data.get('due_date')
         milestone = cleaned_data.get("milestone")
@@ -117,27 +166,30 @@ class TaskForm(forms.ModelForm):
         instance = self.instance
         
         
-        if instance and instance.pk and prerequisites: 
-            target_id = instance.pk 
-    
-            for proposed_prerequisite in prerequisites:
-                # We call the model's authoritative method.
-                if proposed_prerequisite.pk and instance.has_cycle(proposed_prerequisite, target_id):
+        if instance and instance.pk and prerequisites:
+            # One walk of the project graph checks the whole batch; depending
+            # on itself is reported separately below
+            cyclic_ids = instance.check_cycles_batch(
+                [pk for pk in prerequisites if pk != instance.pk]
+            )
+            if cyclic_ids:
+                for title in Task.objects.filter(pk__in=cyclic_ids).values_list('title', flat=True):
                     self.add_error(
-                        "prerequisite_tasks", 
-                        f"Dependency cycle detected. Task cannot depend on {proposed_prerequisite.title}."
+                        "prerequisite_tasks",
+                        f"Dependency cycle detected. Task cannot depend on {title}."
                     )
         
         # Self-dependency check (Ensuring we don't return early)
-        if instance and instance.pk and instance in prerequisites:
+        if instance and instance.pk and prerequisites and instance.pk in prerequisites:
             self.add_error('prerequisite_tasks', "A task cannot depend on itself.")
             
 
         # Finish-to-Start (FS) dependency check for multiple parents
-        if prerequisites and start_date:
-            # Find the latest due date among all selected prerequisites
-            latest_prereq_due_date = max(
-                [p.due_date for p in prerequisites if p.due_date] or [start_date]
+        if start_date and prerequisites:
+            # Find the latest due date among all selected prerequisites in SQL
+            latest_prereq_due_date = (
+                Task.objects.filter(pk__in=prerequisites)
+                .aggregate(Max('due_date'))['due_date__max'] or start_date
             )
             
             if start_date < latest_prereq_due_date:
@@ -165,14 +217,10 @@ class TaskForm(forms.ModelForm):
         #if self.project and not task.project_id:
             #task.project = self.project
 
-        # Capture old milestone before save (for model.save and signals)
-        if task.pk:
-            old_milestone_id = Task.objects.filter(pk=task.pk).values_list("milestone_id", flat=True).first()
-        else:
-            old_milestone_id = None
-
-        task._old_milestone_id = old_milestone_id
-        task._original_milestone_id = old_milestone_id
+        # Capture old milestone before save (for model.save and signals).
+        # Task.__init__ recorded it when the instance was loaded, before the
+        # form assigned the new one, so no query is needed.
+        task._old_milestone_id = task._original_milestone_id if task.pk else None
         
         # Only handle ManyToMany after commit (when PK exists)
         if commit:
@@ -194,10 +242,8 @@ class TaskForm(forms.ModelForm):
             # --- new tags ---
             new_tags = self.cleaned_data.get('new_tags', '')
             if new_tags:
-                new_tags_list = [t.strip() for t in new_tags.split(',') if t.strip()]
-                for tag_name in new_tags_list:
-                    tag, _ = Tag.objects.get_or_create(name=tag_name, project=task.project)
-                    task.tags.add(tag)
+                new_tags_list = Tag.parse_names(new_tags)
+                task.tags.add(*Tag.get_or_create_many(task.project, new_tags_list))
 
         return task
     
@@ -214,34 +260,26 @@ class MilestoneForm(forms.ModelForm):
         model = Milestone
         # Fields the user needs to set:
         fields = ['name', 'description', 'milestone_type', 'due_date']          
+        widgets = {
+            'due_date': forms.DateInput(attrs={'type': 'date'}),
+        }
 
     def __init__(self, *args, **kwargs):        
         project = kwargs.pop('project', None)
         self.project = project
         
         super().__init__(*args, **kwargs)
-        
-        self.fields['tasks'].widget = forms.SelectMultiple(
-            attrs={
-                'class': 'form-control select2',
-                'id': 'id_tasks'
-            }
-        )
-        
-        self.fields['due_date'].widget = forms.DateInput(
-            attrs={'type': 'date'}
-        )
-            
-        if self.project and not self.instance.pk:
-            latest_task_date = self.project.tasks.filter(milestone__isnull=True).aggregate(Max('due_date'))['due_date__max']
             
-            if latest_task_date and not self.initial.get('due_date'):
-                self.fields['due_date'].initial = latest_task_date     
-
         if self.project: 
             #tasks_qs = self.project.tasks.all()
             unassigned_tasks = self.project.tasks.filter(milestone__isnull=True)
-            
+
+            # The suggested date only matters when an unbound create form is rendered
+            if not self.instance.pk and not self.is_bound and not self.initial.get('due_date'):
+                latest_task_date = unassigned_tasks.aggregate(Max('due_date'))['due_date__max']
+                if latest_task_date:
+                    self.fields['due_date'].initial = latest_task_date
+
             if self.instance and self.instance.pk:
                 current_tasks = self.instance.tasks.all() 
                 
@@ -260,10 +298,11 @@ class MilestoneForm(forms.ModelForm):
         tasks = cleaned.get("tasks")
         due_date = cleaned.get("due_date")
 
-        if tasks and tasks.exists():
+        if tasks is not None:
+            # A single MAX() also covers the "no tasks selected" case (None).
             latest_task_date = tasks.aggregate(Max("due_date"))["due_date__max"]
 
-            if due_date and due_date < latest_task_date:
+            if latest_task_date and due_date and due_date < latest_task_date:
                 raise ValidationError(
                     f"The target date cannot be earlier than the latest task due date ({latest_task_date})."
                 )
@@ -282,18 +321,17 @@ class MilestoneForm(forms.ModelForm):
                 selected_tasks = self.cleaned_data.get("tasks")            
                 
                 if selected_tasks is not None:
-                    # Convert to IDs (empty list if no tasks selected)
-                    selected_task_ids = list(selected_tasks.values_list('id', flat=True))
-
-                    # Remove milestone from tasks that are no longer selected
-                    Task.objects.filter(milestone=milestone)\
-                        .exclude(id__in=selected_task_ids)\
-                        .update(milestone=None)
-
-                    # Assign milestone to selected tasks
-                    if selected_task_ids:
-                        Task.objects.filter(id__in=selected_task_ids)\
-                            .update(milestone=milestone)
+                    # Convert to IDs once (empty tuple if no tasks selected)
+                    selected_task_ids = tuple(selected_tasks.values_list('id', flat=True))
+
+                    # One UPDATE: assign the milestone to selected tasks and
+                    # detach it from tasks that are no longer selected
+                    Task.objects.filter(Q(milestone=milestone) | Q(id__in=selected_task_ids))\
+                        .update(milestone=Case(
+                            When(id__in=selected_task_ids, then=Value(milestone.pk)),
+                            default=Value(None),
+                            output_field=BigIntegerField(),
+                        ))
                         
         return milestone
 
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-15 14:53
+
+import django.db.models.functions.text
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def merge_case_duplicate_tags(apps, schema_editor):
+    """Folds tags whose names differ only by case into the oldest one.
+
+    The new constraint would reject such pairs. Tasks tagged with a
+    duplicate are re-tagged with the kept tag before the duplicate is
+    deleted (which removes its task_tags rows).
+    """
+    Tag = apps.get_model('projectapp', 'Tag')
+    TaskTags = apps.get_model('projectapp', 'Task').tags.through
+    db = schema_editor.connection.alias
+
+    groups = defaultdict(list)
+    for tag_id, project_id, name in Tag.objects.using(db).order_by('pk').values_list('pk', 'project_id', 'name'):
+        groups[project_id, name.lower()].append(tag_id)
+
+    for keep_id, *duplicate_ids in groups.values():
+        if not duplicate_ids:
+            continue
+        tagged = set(TaskTags.objects.using(db).filter(tag_id=keep_id).values_list('task_id', flat=True))
+        moved = (
+            TaskTags.objects.using(db)
+            .filter(tag_id__in=duplicate_ids)
+            .exclude(task_id__in=tagged)
+            .values_list('task_id', flat=True)
+            .distinct()
+        )
+        TaskTags.objects.using(db).bulk_create([TaskTags(task_id=task_id, tag_id=keep_id) for task_id in moved])
+        Tag.objects.using(db).filter(pk__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projectapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='tag',
+            unique_together=set(),
+        ),
+        migrations.RunPython(merge_case_duplicate_tags, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='tag',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), models.F('project'), name='tag_name_ci_uniq'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-15 16:14
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projectapp', '0003_task_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(models.F('project'), django.db.models.functions.text.Lower('title'), name='task_project_title_idx'),
+        ),
+    ]
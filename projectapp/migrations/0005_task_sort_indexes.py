@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-15 16:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projectapp', '0004_task_title_lower_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'priority', 'due_date'], name='task_proj_prio_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'due_date', '-priority'], name='task_proj_due_prio_idx'),
+        ),
+    ]
@@ -1,10 +1,53 @@
-from django.db import models, transaction
+import threading
+from collections import defaultdict
+from django.db import models, router, transaction
 from datetime import date
 from django.core.exceptions import ValidationError
-from django.db.models import Max, Count
+from django.db.models import Max, Case, Count, Exists, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Lower
+from django.utils.functional import cached_property
 
 # Create your models here.
 
+# Milestone ids waiting for a due-date recalculation, per thread and database
+# alias (connections are per thread too); see recalculate_due_dates_on_commit()
+_pending_recalculations = threading.local()
+
+
+def _pending_milestone_ids(alias):
+    if not hasattr(_pending_recalculations, 'by_alias'):
+        _pending_recalculations.by_alias = defaultdict(set)
+    return _pending_recalculations.by_alias[alias]
+
+
+def _count_per_project(queryset):
+    """Correlated COUNT of the queryset's rows that belong to the outer project."""
+    counts = (
+        queryset.filter(project=OuterRef('pk'))
+        .order_by().values('project')
+        .annotate(n=Count('pk')).values('n')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+class ProjectQuerySet(models.QuerySet):
+    def with_progress(self):
+        """Annotates the counts behind Project.progress, one subquery each,
+        so reading progress on the results needs no further queries.
+        """
+        open_tasks = Task.objects.filter(milestone=OuterRef('pk')).exclude(status=Task.DONE)
+        return self.annotate(
+            task_count=_count_per_project(Task.objects.all()),
+            done_task_count=_count_per_project(Task.objects.filter(status=Task.DONE)),
+            stray_task_count=_count_per_project(Task.objects.filter(milestone__isnull=True)),
+            done_stray_task_count=_count_per_project(
+                Task.objects.filter(milestone__isnull=True, status=Task.DONE)
+            ),
+            milestone_count=_count_per_project(Milestone.objects.all()),
+            complete_milestone_count=_count_per_project(Milestone.objects.filter(~Exists(open_tasks))),
+        )
+
+
 class Project(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
@@ -12,28 +55,32 @@ class Project(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     #progress = models.FloatField(default=0.0) # Percentage completion (used in views)
 
+    objects = ProjectQuerySet.as_manager()
+
     class Meta:
         ordering = ['title']
 
     def __str__(self):
         return self.title
 
-    def _calculate_progress_value(self):
-        """Calculates the project progress value without saving."""
-        total_tasks = self.tasks.count()
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        # Task rows may have changed in bulk, so recompute progress on next read
+        self.__dict__.pop('progress', None)
+        self.__dict__.pop('complete_milestone_count', None)
+
+    @staticmethod
+    def _progress_from_counts(total_tasks, done_tasks, total_stray_tasks, done_stray_tasks,
+                              total_milestones, completed_milestones):
+        """Applies the progress rules to task and milestone counts."""
         if total_tasks == 0:
             return 0.0
 
-        milestones = self.milestones.all()
-
-        if milestones.exists():
-            if not self.tasks.exclude(status='done').exists():
+        if total_milestones:
+            if done_tasks == total_tasks:
                 return 100.0  
-            completed_milestones = sum(1 for m in milestones if m.is_complete)
-            milestone_completion_ratio = completed_milestones / milestones.count()
+            milestone_completion_ratio = completed_milestones / total_milestones
            
-            total_stray_tasks = self.tasks.filter(milestone__isnull=True).count()
-            done_stray_tasks = self.tasks.filter(milestone__isnull=True, status='done').count()
             if total_stray_tasks == 0:
                 progress = milestone_completion_ratio * 100.0          
             else:
@@ -42,12 +89,50 @@ class Project(models.Model):
             return round(min(progress, 100.0), 2)
 
         else:            
-            done = self.tasks.filter(status='done').count()
-            return round((done / total_tasks * 100), 2)
+            return round((done_tasks / total_tasks * 100), 2)
+
+    def _calculate_progress_value(self):
+        """Calculates the project progress value without saving."""
+        # Query the models directly: a prefetched self.milestones/self.tasks
+        # would aggregate over the (possibly annotated) prefetch queryset.
+        task_counts = Task.objects.filter(project=self).aggregate(
+            total=Count('id'),
+            done=Count('id', filter=Q(status=Task.DONE)),
+            stray_total=Count('id', filter=Q(milestone__isnull=True)),
+            stray_done=Count('id', filter=Q(milestone__isnull=True, status=Task.DONE)),
+        )
+        if task_counts['total'] == 0:
+            return 0.0
+
+        # A milestone is complete when none of its tasks are open (see Milestone.is_complete)
+        open_tasks = Task.objects.filter(milestone=OuterRef('pk')).exclude(status=Task.DONE)
+        milestone_counts = Milestone.objects.filter(project=self).aggregate(
+            total=Count('id'),
+            complete=Count('id', filter=~Exists(open_tasks)),
+        )
+
+        return self._progress_from_counts(
+            task_counts['total'], task_counts['done'],
+            task_counts['stray_total'], task_counts['stray_done'],
+            milestone_counts['total'], milestone_counts['complete'],
+        )
         
-    @property
+    @cached_property
     def progress(self):
-        """Public access to the always up-to-date progress value."""
+        """Public access to the progress value, computed once per instance.
+
+        Project instances live for a single request, so the value is
+        request-scoped; saving a task through this instance, or
+        refresh_from_db(), clears it.
+        Rows loaded through Project.objects.with_progress() reuse the
+        annotated counts instead of querying again.
+        """
+        if hasattr(self, 'complete_milestone_count'):
+            return self._progress_from_counts(
+                self.task_count, self.done_task_count,
+                self.stray_task_count, self.done_stray_task_count,
+                self.milestone_count, self.complete_milestone_count,
+            )
         return self._calculate_progress_value()
 
 class Tag(models.Model):
@@ -55,28 +140,72 @@ class Tag(models.Model):
     project = models.ForeignKey(Project, related_name='tags', on_delete=models.CASCADE)
     
     class Meta:
-        unique_together = ('name', 'project')
+        constraints = [
+            # Tag names are unique per project regardless of case
+            models.UniqueConstraint(Lower('name'), 'project', name='tag_name_ci_uniq'),
+        ]
         ordering = ['name'] 
     
     def __str__(self):
         return f"{self.name} on {self.project.title}"
 
+    @staticmethod
+    def parse_names(text):
+        """Splits a comma-separated tag list into its distinct, non-empty names, in order."""
+        names = (name.strip() for name in text.split(','))
+        return list(dict.fromkeys(name for name in names if name))
+
+    @classmethod
+    def get_or_create_many(cls, project, names):
+        """Returns the project's tags with the given names, creating missing ones.
+
+        Names match existing tags case-insensitively. All names go into one
+        INSERT and the tag_name_ci_uniq constraint drops those that already
+        exist, so creating costs one query however many names are given.
+        The returned queryset is lazy.
+        """
+        by_lower = {}
+        for name in names:
+            by_lower.setdefault(name.lower(), name)
+
+        cls.objects.bulk_create(
+            [cls(project=project, name=name) for name in by_lower.values()],
+            ignore_conflicts=True,
+        )
+        return cls.objects.annotate(lower_name=Lower('name')).filter(
+            project=project, lower_name__in=by_lower
+        )
+
+
+class TaskQuerySet(models.QuerySet):
+    def with_overdue(self, today=None):
+        """Annotates overdue, computed in SQL with the same rule as Task.is_overdue()."""
+        today = today or date.today()
+        return self.annotate(overdue=Case(
+            When(Q(due_date__lt=today) & ~Q(status=Task.DONE), then=Value(True)),
+            default=Value(False),
+            output_field=models.BooleanField(),
+        ))
+
 
 class Task(models.Model):
-    STATUS_CHOICES = [
-        ('todo', 'To Do'),
-        ('in_progress', 'In Progress'),
-        ('done', 'Done'),
-    ]
+    TODO = 'todo'
+    IN_PROGRESS = 'in_progress'
+    DONE = 'done'
+    STATUS_CHOICES = (
+        (TODO, 'To Do'),
+        (IN_PROGRESS, 'In Progress'),
+        (DONE, 'Done'),
+    )
     
     LOW = 1
     MEDIUM = 2
     HIGH = 3
-    PRIORITY_CHOICES = [
+    PRIORITY_CHOICES = (
         (LOW, 'Low'),
         (MEDIUM, 'Medium'),
         (HIGH, 'High'),
-    ]   
+    )   
 
     project = models.ForeignKey(Project, related_name='tasks', on_delete=models.CASCADE)
     title = models.CharField(max_length=255)
@@ -84,7 +213,7 @@ class Task(models.Model):
     start_date = models.DateField(null=True, blank=True)
     due_date = models.DateField()
     priority = models.IntegerField(choices=PRIORITY_CHOICES, default=MEDIUM)
-    status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='todo')
+    status = models.CharField(max_length=15, choices=STATUS_CHOICES, default=TODO)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     # --- WBS Hierarchy Link ---
@@ -102,40 +231,106 @@ class Task(models.Model):
         related_name='dependents',
     )
     tags = models.ManyToManyField(Tag, related_name='tasks', blank=True)
+
+    objects = TaskQuerySet.as_manager()
     
     class Meta:
         ordering = ["due_date", "-priority"]
+        indexes = [
+            # Progress counts and board columns filter a project's tasks by status
+            models.Index(fields=['project', 'status'], name='task_project_status_idx'),
+            models.Index(fields=['project', 'milestone', 'status'], name='task_proj_ms_status_idx'),
+            # Default ordering
+            models.Index(fields=['due_date'], name='task_due_date_idx'),
+            # Project detail sorts a project's tasks by title, ignoring case
+            models.Index('project', Lower('title'), name='task_project_title_idx'),
+            # The board, the detail page and the default ordering sort a project's
+            # tasks by priority or by due date
+            models.Index(fields=['project', 'priority', 'due_date'], name='task_proj_prio_due_idx'),
+            models.Index(fields=['project', 'due_date', '-priority'], name='task_proj_due_prio_idx'),
+        ]
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._original_due_date = self.due_date
-        self._original_milestone_id = self.milestone_id
+        # Read from __dict__ so deferred columns stay deferred: touching one
+        # would refresh it, and the refresh builds another Task (recursing).
+        self._original_due_date = self.__dict__.get('due_date')
+        self._original_milestone_id = self.__dict__.get('milestone_id')
     
     def __str__(self):
         return f"{self.title} (Due: {self.due_date})"
 
       
-    def is_overdue(self):
-        return self.due_date < date.today() and self.status != 'done'
+    def is_overdue(self, today=None):
+        """Pass today when checking many tasks so the date is read only once."""
+        today = today or date.today()
+        return self.due_date < today and self.status != self.DONE
     
-    def has_cycle(self, parent, target_id, visited=None):
-        if visited is None:
-            visited = set()
+    @classmethod
+    def _load_prereq_graph(cls, task_ids, stop_at=None):
+        """Maps each task id reachable from task_ids to the ids of its prerequisites.
 
-        if parent.pk == target_id:
-            return True
+        Edges are followed one level per query, across projects: nothing
+        keeps a prerequisite inside its dependent's project, so a cycle may
+        pass through other projects. Loading stops early once stop_at is
+        reached, since the walk looking for it is then bound to succeed.
+        """
+        through = cls.prerequisite_tasks.through
+        graph = defaultdict(list)
+        seen = set()
+        frontier = set(task_ids)
+        while frontier and stop_at not in frontier:
+            seen |= frontier
+            edges = through.objects.filter(from_task_id__in=frontier).values_list('from_task_id', 'to_task_id')
+            frontier = set()
+            for from_id, to_id in edges:
+                graph[from_id].append(to_id)
+                if to_id not in seen:
+                    frontier.add(to_id)
+        return graph
 
-        if parent.pk in visited:
-            return False
+    def check_cycles_batch(self, parents, target_id=None, graph=None):
+        """Returns the parents that would close a cycle through target_id (default: this task).
 
-        visited.add(parent.pk)
+        parents may be Task instances or task ids; the offending ones are
+        returned as given. This is the one cycle check behind Task.clean(),
+        TaskForm, TaskSerializer and the m2m signal.
 
-        for grandparent in parent.prerequisite_tasks.all():
-            if self.has_cycle(grandparent, target_id, visited):
-                return True
+        graph is a prerequisite graph from _load_prereq_graph() covering the
+        parents; without one it is loaded here, one query per level of
+        prerequisites shared by the whole batch. Callers checking several
+        batches against the same state can load it once and pass it in. Nodes a walk fully explored without reaching target_id
+        are shared across the batch, so ancestors common to several parents
+        are walked once.
+        """
+        if not parents:
+            return []
+        if target_id is None:
+            target_id = self.pk
+        if graph is None:
+            graph = self._load_prereq_graph(
+                [getattr(parent, 'pk', parent) for parent in parents], stop_at=target_id
+            )
+
+        cleared = set()  # cannot reach target_id
+        offending = []
+        for parent in parents:
+            stack = [getattr(parent, 'pk', parent)]
+            visited = set()
+            while stack:
+                task_id = stack.pop()
+                if task_id == target_id:
+                    offending.append(parent)
+                    break
+                if task_id in visited or task_id in cleared:
+                    continue
+                visited.add(task_id)
+                stack.extend(graph.get(task_id, ()))
+            else:
+                cleared |= visited
+
+        return offending
 
-        return False
-    
     def clean(self):
         super().clean()
         
@@ -164,15 +359,16 @@ class Task(models.Model):
         
         # Circular dependency logic
         if self.pk:            
-            for parent in self.prerequisite_tasks.all():
-                if parent.pk == self.pk:
-                    raise ValidationError(
-                        {"prerequisite_tasks": "A task cannot be its own prerequisite."}
-                    )
-                if parent.pk and self.has_cycle(parent, self.pk):
-                    raise ValidationError(
-                        {"prerequisite_tasks": f"Circular dependency: cannot depend on '{parent.title}'."}
-                    )
+            parents = list(self.prerequisite_tasks.all())
+            if any(parent.pk == self.pk for parent in parents):
+                raise ValidationError(
+                    {"prerequisite_tasks": "A task cannot be its own prerequisite."}
+                )
+            cyclic = self.check_cycles_batch(parents)
+            if cyclic:
+                raise ValidationError(
+                    {"prerequisite_tasks": f"Circular dependency: cannot depend on '{cyclic[0].title}'."}
+                )
     
     def save(self, *args, **kwargs):
         from .models import Milestone  # local import avoids circular issues
@@ -183,26 +379,70 @@ class Task(models.Model):
         milestone_changed = (self.milestone_id != old_milestone_id)
         date_changed = (self.due_date != old_due)
 
+        # A partial save that writes neither milestone nor due_date cannot
+        # move a milestone date, so the recalculation branch is skipped
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not {'milestone', 'milestone_id', 'due_date'} & set(update_fields):
+            super().save(*args, **kwargs)
+            self._forget_cached_summaries()
+            return
+
         with transaction.atomic():
             # long-running queries, sending emails, or anything external!
             super().save(*args, **kwargs)
 
+            # Recalculations are queued until commit, so a batch of task saves
+            # (and the post_save signal) updates each milestone only once.
             # 1. New milestone receives recalculation
             if self.milestone_id and (milestone_changed or date_changed):
-                self.milestone.recalculate_and_save_date()
+                Milestone.recalculate_due_dates_on_commit(self.milestone_id)
 
             # 2. Old milestone needs recalculation if task was moved away
             if milestone_changed and old_milestone_id is not None:
-                try:
-                    old_ms = Milestone.objects.get(pk=old_milestone_id)
-                    old_ms.recalculate_and_save_date()
-                except Milestone.DoesNotExist:
-                    pass
+                Milestone.recalculate_due_dates_on_commit(old_milestone_id)
 
             # Update tracking values
             self._original_milestone_id = self.milestone_id
             self._original_due_date = self.due_date
 
+            self._forget_cached_summaries()
+
+    def _forget_cached_summaries(self):
+        # A cached progress on the loaded project, and the completion of the
+        # loaded milestone, are now stale
+        if Task.project.is_cached(self):
+            self.project.__dict__.pop('progress', None)
+        if Task.milestone.is_cached(self) and self.milestone is not None:
+            self.milestone.forget_task_summary()
+
+class MilestoneQuerySet(models.QuerySet):
+    def with_open_tasks(self):
+        """Annotates the number of unfinished tasks, which is_complete then reads."""
+        return self.annotate(open_tasks=Count('tasks', filter=~Q(tasks__status=Task.DONE)))
+
+    def with_latest_due(self):
+        """Annotates latest_due: the latest task due date, or the milestone's own due_date."""
+        return self.annotate(latest_due=Coalesce(Max('tasks__due_date'), F('due_date')))
+
+    def recalculate_due_dates(self):
+        """Moves each milestone's due_date to its latest task due date in one UPDATE.
+
+        Milestones without tasks, or whose date already matches, are not
+        written. Returns the number of milestones changed.
+        """
+        latest = Subquery(
+            Task.objects.filter(milestone=OuterRef('pk'))
+            .order_by().values('milestone')
+            .annotate(latest=Max('due_date')).values('latest')
+        )
+        return (
+            self.annotate(latest_task_due=latest)
+            .filter(latest_task_due__isnull=False)
+            .exclude(due_date=F('latest_task_due'))
+            .update(due_date=latest)
+        )
+
+
 class Milestone(models.Model):
     project = models.ForeignKey(
         'Project',
@@ -236,33 +476,67 @@ class Milestone(models.Model):
         help_text="Designate if this is a formal client gate, Sponsor Sign-off or an internal checkpoint."
     )
 
+    objects = MilestoneQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.name} ({self.project.title})"
 
-    @property
+    @cached_property
     def is_complete(self):
-        """A Milestone is complete only if ALL linked tasks are in the 'done' status."""
+        """A Milestone is complete only if ALL linked tasks are in the 'done' status.
+
+        Computed once per instance; refresh_from_db() and task saves through
+        this instance clear it.
+        """
+        # Rows from Milestone.objects.with_open_tasks() already carry the count.
+        if hasattr(self, 'open_tasks'):
+            return self.open_tasks == 0
         # Access tasks using the related_name 'tasks' from the ForeignKey on the Task model.
-        return not self.tasks.exclude(status='done').exists()
+        return not self.tasks.exclude(status=Task.DONE).exists()
     
     def latest_due_date(self):
         """Returns the latest due date among all tasks linked to this milestone."""
-        # Uses aggregation for efficiency
+        # Rows from Milestone.objects.with_latest_due() already carry the date.
+        if hasattr(self, 'latest_due'):
+            return self.latest_due
+        # Uses aggregation for efficiency; kept like the annotation so later
+        # calls on this instance reuse it
         latest_date = self.tasks.aggregate(max_date=models.Max('due_date'))['max_date']
-        return latest_date or self.due_date
+        self.latest_due = latest_date or self.due_date
+        return self.latest_due
+
+    def forget_task_summary(self):
+        """Drops the cached is_complete and latest due date, and the annotations behind them."""
+        for name in ('is_complete', 'open_tasks', 'latest_due'):
+            self.__dict__.pop(name, None)
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.forget_task_summary()
     
-    def recalculate_and_save_date(self):
-        """
-        Recalculate the milestone due_date from linked tasks and save if different.
-        Keeps behaviour simple: set milestone.due_date = max(task.due_date) if any tasks exist.
+    @classmethod
+    def recalculate_due_dates_on_commit(cls, *milestone_ids):
+        """Queues milestones for one recalculate_due_dates() when the transaction commits.
+
+        Ids queued during a transaction gather in one pending set. Each call
+        queues a callback, but the first to run takes the whole set, and the
+        callbacks after it find the set empty and do nothing. So each
+        milestone is recalculated at most once per transaction. Ids queued
+        in a rolled-back transaction stay pending and are picked up by the
+        next flush; recalculating is idempotent. Outside a transaction the
+        recalculation runs immediately.
         """
-        latest = self.tasks.aggregate(max_date=models.Max('due_date'))['max_date']
-        # If there are no tasks, we keep the existing due_date (same as current behavior)
-        if latest is None:
-            return
+        alias = router.db_for_write(cls)
+        pending = _pending_milestone_ids(alias)
+        pending.update(milestone_ids)
+
+        def flush():
+            if not pending:
+                return
+            ids = set(pending)
+            pending.clear()
+            cls.objects.using(alias).filter(pk__in=ids).recalculate_due_dates()
+
+        transaction.on_commit(flush, using=alias)
 
-        if latest != self.due_date:
-            # update only the due_date field to avoid touching other fields/side-effects
-            self.due_date = latest
-            self.save(update_fields=['due_date'])
     
\ No newline at end of file
@@ -0,0 +1,25 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson.
+
+    orjson writes UTF-8 bytes directly, so the str -> bytes round-trip of
+    the stock renderer is skipped. Types orjson does not know (Decimal,
+    lazy translation strings, querysets) go through DRF's JSONEncoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        option = orjson.OPT_NON_STR_KEYS
+        # The browsable API asks for indented output
+        if self.get_indent(accepted_media_type, renderer_context):
+            option |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=JSONEncoder().default, option=option)
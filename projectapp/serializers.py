@@ -1,27 +1,107 @@
+import copy
 from rest_framework import serializers
 from datetime import date
 from .models import Project, Task, Milestone, Tag
-from django.db.models import Count, Max
+from django.db.models import Count, Max, Prefetch
 from rest_framework.exceptions import ValidationError
 from django.urls import reverse
+from django.utils.functional import cached_property
 
 # Serializers for the models, used to convert data
 # to and from JSON for API requests and responses.
 
-class TagSerializer(serializers.ModelSerializer):
+class CachedFieldsMixin:
+    """
+    Builds the field set once per class and resolves the readable and
+    writable fields once per serializer instance.
+
+    ModelSerializer.get_fields() introspects the model on every
+    instantiation. None of these serializers vary their fields per
+    request, so the built fields are kept on the class and each instance
+    gets a deep copy (DRF deep-copies declared fields the same way).
+
+    DRF also re-filters ``self.fields`` on every ``to_representation``
+    call. With ``many=True`` a single child serializer renders every row,
+    so caching the tuple here means the filtering runs once per list.
+    """
+    def get_fields(self):
+        cls = type(self)
+        # Looked up in the class's own __dict__ so subclasses build their own
+        if '_cached_fields' not in cls.__dict__:
+            cls._cached_fields = super().get_fields()
+        return copy.deepcopy(cls._cached_fields)
+
+    @cached_property
+    def _readable_fields(self):
+        return tuple(field for field in self.fields.values() if not field.write_only)
+
+    @cached_property
+    def _writable_fields(self):
+        return tuple(field for field in self.fields.values() if not field.read_only)
+
+class TemplatedURLMixin:
+    """
+    For hyperlinked fields: reverses the detail URL once per field
+    instance and substitutes each row's pk into it.
+
+    A serializer (and so its fields) lives for one request, so nested
+    lists of many rows share a single resolver walk.
+    """
+    def get_url(self, obj, view_name, request, format):
+        if obj.pk is None:
+            return None
+        if format or self.lookup_field != 'pk':
+            return super().get_url(obj, view_name, request, format)
+
+        if not hasattr(self, '_url_parts'):
+            url = self.reverse(view_name, kwargs={'pk': 0}, request=request)
+            self._url_parts = url.rpartition('/0')[::2]
+        head, tail = self._url_parts
+        return f"{head}/{obj.pk}{tail}"
+
+
+class TemplatedIdentityField(TemplatedURLMixin, serializers.HyperlinkedIdentityField):
+    pass
+
+
+class TemplatedRelatedField(TemplatedURLMixin, serializers.HyperlinkedRelatedField):
+    pass
+
+
+class TagSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     url = serializers.HyperlinkedIdentityField(
         view_name='api-tags-detail',
         read_only=True
     )
     project = serializers.SlugRelatedField(
         slug_field='title',  # Use the 'title' attribute of the Project model
-        queryset=Project.objects.all()
+        # Writes resolve the title with one WHERE title = %s lookup; only the
+        # pk is needed from the matched row.
+        queryset=Project.objects.only('id', 'title')
     )
     class Meta:
         model = Tag
         fields = ['url', 'id', 'name', 'project']
 
-class TaskSerializer(serializers.ModelSerializer):
+    def validate(self, data):
+        """Rejects a name already used in the project, ignoring case.
+
+        DRF builds no validator for the tag_name_ci_uniq expression
+        constraint, so the check is made here.
+        """
+        instance = self.instance
+        name = data.get('name', instance.name if instance else None)
+        project = data.get('project') or (instance.project if instance else None)
+        duplicates = Tag.objects.filter(project=project, name__iexact=name)
+        if instance is not None:
+            duplicates = duplicates.exclude(pk=instance.pk)
+        if duplicates.exists():
+            raise serializers.ValidationError(
+                f"A tag named '{name}' already exists in this project."
+            )
+        return data
+
+class TaskSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     # This field generates the hyperlink for the specific task instance.
     url = serializers.HyperlinkedIdentityField(
         view_name='api-tasks-detail',
@@ -38,17 +118,26 @@ class TaskSerializer(serializers.ModelSerializer):
     new_tags = serializers.CharField(write_only=True, required=False)
     
     # --- Project info ---
-    project_info = serializers.SerializerMethodField()
+    project_title = serializers.CharField(source='project.title', read_only=True)
+    project_url = TemplatedRelatedField(
+        source='project',
+        view_name='api-projects-detail',
+        read_only=True
+    )
     
+    # A pk lookup; validate() checks the milestone's project
     milestone = serializers.PrimaryKeyRelatedField(
-        queryset=Milestone.objects.all(),
+        queryset=Milestone.objects.only('id', 'project_id'),
         allow_null=True,
         required=False,        
     )
     
     # --- Prerequisite tasks ---
+    # validate() rejects prerequisites from another project, so the queryset
+    # is not narrowed per request.
     prerequisite_tasks = serializers.PrimaryKeyRelatedField(
-        queryset=Task.objects.all(),
+        # Columns validate() reads
+        queryset=Task.objects.only('id', 'title', 'project_id'),
         many=True,
         required=False,
         write_only=True
@@ -56,62 +145,34 @@ class TaskSerializer(serializers.ModelSerializer):
     prerequisite_task_ids = serializers.SerializerMethodField()
     prerequisite_titles = serializers.SerializerMethodField()
 
-    def get_project_info(self, obj):
-        """Returns the project's title and its canonical URL."""
-        project_url = self.context['request'].build_absolute_uri(
-            reverse('api-projects-detail', kwargs={'pk': obj.project.pk})
-        )
-        return {
-            'title': obj.project.title,
-            'url': project_url
-        }
-    
     class Meta:
         model = Task
         fields = [
-            'url', 'id', 'title', 'description', 'start_date', 'due_date', 'priority', 'status', 'created_at', 'project', 'project_info', 'milestone',
+            'url', 'id', 'title', 'description', 'start_date', 'due_date', 'priority', 'status', 'created_at', 'project', 'project_title', 'project_url', 'milestone',
             'prerequisite_tasks', 'prerequisite_task_ids', 'prerequisite_titles',
             'tags', 'tag_ids', 'new_tags'
         ]
         
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        request = self.context.get("request")
-        
-        # Only proceed if we have request context and the field exists
-        if not request or "prerequisite_tasks" not in self.fields:
-            return
-
-        project = None
-        if self.instance:
-            # Case 1: Updating existing Task
-            project = self.instance.project
-        elif request.data.get("project"):
-            # Case 2: Creating new Task (project is in request data)
-            try:
-                project = Project.objects.get(id=request.data["project"])
-            except Project.DoesNotExist:
-                # Let general validation catch invalid project ID later
-                pass
-        
-        if project:
-            # Filter prerequisite tasks to same-project only
-            self.fields["prerequisite_tasks"].queryset = Task.objects.filter(project=project)
-        else:
-            # Prevent selection if project is undetermined
-            self.fields["prerequisite_tasks"].queryset = Task.objects.none()
-        
     # -----------------------------
     # Helper method for read-only representations
     # -----------------------------
+    def _prerequisite_columns(self, obj):
+        """Splits obj's (prefetched) prerequisites into (ids, titles) in a single pass."""
+        if not hasattr(obj, '_prerequisite_columns'):
+            ids, titles = [], []
+            for task in obj.prerequisite_tasks.all():
+                ids.append(task.id)
+                titles.append(task.title)
+            obj._prerequisite_columns = (ids, titles)
+        return obj._prerequisite_columns
+
     def get_prerequisite_titles(self, obj):
         """Returns a list of titles for all prerequisite tasks."""
-        return [task.title for task in obj.prerequisite_tasks.all()]
+        return self._prerequisite_columns(obj)[1]
 
     def get_prerequisite_task_ids(self, obj):
         """Returns a list of IDs for all prerequisite tasks."""
-        return [task.id for task in obj.prerequisite_tasks.all()]
+        return self._prerequisite_columns(obj)[0]
 
     
     # Validation 
@@ -129,11 +190,13 @@ class TaskSerializer(serializers.ModelSerializer):
             self.instance.milestone if self.instance else None
         )
         instance = self.instance
+        # Every problem is collected and reported in one response
+        errors = {}
         
-        if milestone and milestone.project != project:
-            raise ValidationError({
-                "milestone": "Milestone must belong to the same project as the task."
-            })
+        if milestone and milestone.project_id != project.pk:
+            errors.setdefault("milestone", []).append(
+                "Milestone must belong to the same project as the task."
+            )
 
         # Use instance fallback for partial updates
         if self.instance:
@@ -141,45 +204,50 @@ class TaskSerializer(serializers.ModelSerializer):
             start_date = start_date if start_date is not None else self.instance.start_date
             due_date = due_date if due_date is not None else self.instance.due_date
 
+        # Materialize once; every prerequisite check below is a single pass over it
+        prerequisites = list(prerequisites)
+        # The cycle check only runs when UPDATING an existing task (where a
+        # cycle is possible); the whole batch shares one walk of the project graph.
+        cyclic_ids = set()
+        if instance:
+            cyclic_ids = {
+                prereq.pk for prereq in instance.check_cycles_batch(
+                    [p for p in prerequisites
+                     if p.pk and p.pk != instance.pk and p.project_id == project.pk]
+                )
+            }
+        prerequisite_errors = []
         for prereq in prerequisites:
-            if prereq.project != project:
-                raise ValidationError({
-                    "prerequisite_tasks": "All prerequisite tasks must belong to the same project."
-                })
-        
-        # Self-dependency check
-        if self.instance and self.instance.pk and self.instance in prerequisites:
-            raise ValidationError({
-                'prerequisite_tasks': "A task cannot depend on itself."
-            })
-            
-        # The check only runs when UPDATING an existing task (where a cycle is possible)
-        if instance: 
-            target_id = instance.pk
-            
-            for proposed_prerequisite in prerequisites:
-                # We check only prerequisites that are saved objects (i.e., have a PK)
-                if proposed_prerequisite.pk and instance.has_cycle(proposed_prerequisite, target_id):
-                    raise ValidationError({
-                        "prerequisite_tasks": f"Dependency cycle detected. Task cannot depend on {proposed_prerequisite.title}."
-                    })
+            if prereq.project_id != project.pk:
+                message = "All prerequisite tasks must belong to the same project."
+            elif instance and prereq.pk == instance.pk:
+                message = "A task cannot depend on itself."
+            elif prereq.pk in cyclic_ids:
+                message = f"Dependency cycle detected. Task cannot depend on {prereq.title}."
+            else:
+                continue
+            if message not in prerequisite_errors:
+                prerequisite_errors.append(message)
+        if prerequisite_errors:
+            errors["prerequisite_tasks"] = prerequisite_errors
         
         # Start < due
         if start_date and due_date and start_date > due_date:
-            raise ValidationError({
-                'due_date': "Due date cannot be before the start date."
-            })
+            errors.setdefault('due_date', []).append("Due date cannot be before the start date.")
 
         # Finish-to-Start rule across all prerequisites
         if prerequisites and start_date:
             latest_prereq_due_date = max(
-                [parent.due_date for parent in prerequisites if parent.due_date] or [start_date]
+                (parent.due_date for parent in prerequisites if parent.due_date), default=start_date
             )
 
             if start_date < latest_prereq_due_date:
-                raise ValidationError({
-                    'start_date': f"Start date must be on or after the latest prerequisite due date ({latest_prereq_due_date})."
-                })
+                errors.setdefault('start_date', []).append(
+                    f"Start date must be on or after the latest prerequisite due date ({latest_prereq_due_date})."
+                )
+
+        if errors:
+            raise ValidationError(errors)
 
         return data
 
@@ -206,10 +274,8 @@ class TaskSerializer(serializers.ModelSerializer):
             task.prerequisite_tasks.set(prerequisite_tasks)
 
         if new_tags_str:
-            new_tags = [t.strip() for t in new_tags_str.split(',') if t.strip()]
-            for tag_name in new_tags:
-                tag, _ = Tag.objects.get_or_create(name=tag_name, project=task.project)
-                task.tags.add(tag)
+            new_tags = Tag.parse_names(new_tags_str)
+            task.tags.add(*Tag.get_or_create_many(task.project, new_tags))
 
         return task
 
@@ -219,11 +285,8 @@ class TaskSerializer(serializers.ModelSerializer):
         new_tags_str = validated_data.pop('new_tags', '').strip()
         
         # This preserves the "old" milestone id for validation and for save() logic.
-        try:
-            # Use a fast DB hit to get the current milestone_id (or None)
-            old_milestone_id = Task.objects.filter(pk=instance.pk).values_list('milestone_id', flat=True).first()
-        except Exception:
-            old_milestone_id = getattr(instance, 'milestone_id', None)
+        # Task.__init__ recorded it when the instance was loaded, so no query is needed.
+        old_milestone_id = getattr(instance, '_original_milestone_id', instance.milestone_id)
 
         # Attach both tracking attributes used by your model/save/signals.
         # Only set them if they are not already present (safeguard).
@@ -237,14 +300,12 @@ class TaskSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
-        # Assign fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-
         # AUTHORITATIVE VALIDATION
         instance.full_clean()  # <-- this enforces Task.clean()
 
-        instance.save()
+        # Write only the submitted columns; Task.save() skips the milestone
+        # recalculation when neither milestone nor due_date is among them
+        instance.save(update_fields=[*validated_data, 'updated_at'])
 
         # M2M handling
         if tag_ids:
@@ -253,14 +314,12 @@ class TaskSerializer(serializers.ModelSerializer):
             instance.prerequisite_tasks.set(prerequisite_tasks)
 
         if new_tags_str:
-            new_tags = [t.strip() for t in new_tags_str.split(',') if t.strip()]
-            for tag_name in new_tags:
-                tag, _ = Tag.objects.get_or_create(name=tag_name, project=instance.project)
-                instance.tags.add(tag)
+            new_tags = Tag.parse_names(new_tags_str)
+            instance.tags.add(*Tag.get_or_create_many(instance.project, new_tags))
 
         return instance
 
-class SimpleTaskSerializer(serializers.ModelSerializer):
+class SimpleTaskSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     A lightweight serializer used exclusively for nesting Tasks inside 
     Milestone and Project detail responses.
@@ -270,15 +329,16 @@ class SimpleTaskSerializer(serializers.ModelSerializer):
     It provides a summary and a clickable link to the full Task detail.
     """
     # Add the hyperlink for the task detail view
-    url = serializers.HyperlinkedIdentityField(
+    url = TemplatedIdentityField(
         view_name='api-tasks-detail', 
         read_only=True
     )
     class Meta:
         model = Task
         fields = ['url', 'id', 'title', 'status', 'due_date']
+        read_only_fields = fields
 
-class SimpleMilestoneSerializer(serializers.ModelSerializer):
+class SimpleMilestoneSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     A lightweight serializer used for nesting Milestones inside 
     Project detail responses, providing only summary data and a direct URL.
@@ -293,38 +353,31 @@ class SimpleMilestoneSerializer(serializers.ModelSerializer):
     class Meta:
         model = Milestone
         fields = ['url', 'id', 'name', 'due_date', 'is_complete']
+        read_only_fields = fields
 
-class MilestoneSerializer(serializers.ModelSerializer):
+class MilestoneSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     # Read-only field derived from the @property in the Milestone model
     is_complete = serializers.ReadOnlyField() 
     
-    # Read-only titles for ease of display (e.g., in a dropdown on the client)
-    project_info = serializers.SerializerMethodField()
+    # Read-only title and link for ease of display (e.g., in a dropdown on the client)
+    project_title = serializers.CharField(source='project.title', read_only=True)
+    project_url = TemplatedRelatedField(
+        source='project',
+        view_name='api-projects-detail',
+        read_only=True
+    )
     tasks = SimpleTaskSerializer(many=True, read_only=True)
 
     class Meta:
         model = Milestone
         fields = [
-            'id', 'project', 'project_info', 'name', 'description', 
+            'id', 'project', 'project_title', 'project_url', 'name', 'description', 
             'due_date', 'milestone_type', 'is_complete', 
             'created_at', 'updated_at',
             'tasks'
         ]
         read_only_fields = ['created_at', 'updated_at', 'project']
 
-    def get_project_info(self, obj):
-        """Returns the project's title and its canonical URL."""
-        if not obj.project:
-            return None
-            
-        project_url = self.context['request'].build_absolute_uri(
-            reverse('api-projects-detail', kwargs={'pk': obj.project.pk})
-        )
-        return {
-            'title': obj.project.title,
-            'url': project_url
-        }
-        
     # --- Validation ---
     
     def validate_due_date(self, value):
@@ -370,31 +423,67 @@ class ProjectSerializer(serializers.HyperlinkedModelSerializer):
             'url': {'view_name': 'api-projects-detail'}
         }
 
-class ProjectListSerializer(serializers.HyperlinkedModelSerializer):
-    task_count = serializers.IntegerField(read_only=True)
-    milestone_count = serializers.IntegerField(read_only=True)
-    latest_due_date = serializers.DateField(read_only=True)
-    progress = serializers.FloatField(read_only=True)
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Prefetches the nested relations this serializer renders.
+
+        Kept next to the field declarations so the prefetch tree changes
+        with them. Each nested serializer renders a few columns; only
+        those are loaded.
+        """
+        return queryset.prefetch_related(
+            Prefetch('tasks', queryset=Task.objects.only(
+                'id', 'project_id', 'milestone_id', 'title', 'status', 'due_date',
+            )),
+            # is_complete reads the open_tasks annotation
+            Prefetch('milestones', queryset=Milestone.objects.only(
+                'id', 'project_id', 'name', 'due_date',
+            ).with_open_tasks()),
+            Prefetch('tags', queryset=Tag.objects.only('id', 'project_id', 'name')),
+        )
 
-    class Meta:
-        model = Project
-        fields = [
-            'url',
-            'id',
-            'title',
-            'description',
-            'created_at',
-            'progress',
-            'task_count',
-            'milestone_count',
-            'latest_due_date',
-        ]
-        extra_kwargs = {
-            'url': {'view_name': 'api-projects-detail'}
+# Columns read from Project.objects.with_progress() rows by serialize_project_list()
+PROJECT_LIST_VALUES = (
+    'id', 'title', 'description', 'created_at', 'latest_due_date',
+    'task_count', 'done_task_count', 'stray_task_count', 'done_stray_task_count',
+    'milestone_count', 'complete_milestone_count',
+)
+
+
+def serialize_project_list(rows, request):
+    """
+    Renders project list rows (dicts from .values(*PROJECT_LIST_VALUES)).
+
+    Every exposed field is a scalar or an annotation, so the rows are
+    mapped straight to output dicts instead of going through a
+    ModelSerializer's per-field to_representation loop. The detail URL
+    is reversed once and the pk substituted per row.
+    """
+    detail_url = request.build_absolute_uri(reverse('api-projects-detail', kwargs={'pk': 0}))
+    url_head, _, url_tail = detail_url.rpartition('/0')
+    created_at = serializers.DateTimeField()
+
+    return [
+        {
+            'url': f"{url_head}/{row['id']}{url_tail}",
+            'id': row['id'],
+            'title': row['title'],
+            'description': row['description'],
+            'created_at': created_at.to_representation(row['created_at']),
+            'progress': Project._progress_from_counts(
+                row['task_count'], row['done_task_count'],
+                row['stray_task_count'], row['done_stray_task_count'],
+                row['milestone_count'], row['complete_milestone_count'],
+            ),
+            'task_count': row['task_count'],
+            'milestone_count': row['milestone_count'],
+            'latest_due_date': row['latest_due_date'] and row['latest_due_date'].isoformat(),
         }
+        for row in rows
+    ]
         
 class TagDetailSerializer(TagSerializer):
     tasks = SimpleTaskSerializer(many=True, read_only=True)
 
     class Meta(TagSerializer.Meta):
-        fields = TagSerializer.Meta.fields + ['tasks']
\ No newline at end of file
+        fields = TagSerializer.Meta.fields + ['tasks']
\ No newline at end of file
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import User, Group
 from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.db import transaction
 from django.dispatch import receiver
 from django.core.exceptions import ValidationError
 
@@ -9,11 +10,33 @@ from .models import Task, Milestone
 # ---------------------------------------------------------
 # 1. Auto-add new users to AuthenticatedUsers group
 # ---------------------------------------------------------
+AUTHENTICATED_GROUP_NAME = 'AuthenticatedUsers'
+# Id of the group once it is known to be committed; None until then
+_authenticated_group_id = None
+
+
+def _remember_authenticated_group(group_id):
+    global _authenticated_group_id
+    _authenticated_group_id = group_id
+
+
 @receiver(post_save, sender=User)
 def add_user_to_authenticated_group(sender, instance, created, **kwargs):
     if created:
-        group, _ = Group.objects.get_or_create(name='AuthenticatedUsers')
-        instance.groups.add(group)
+        group_id = _authenticated_group_id
+        if group_id is None:
+            group, _ = Group.objects.get_or_create(name=AUTHENTICATED_GROUP_NAME)
+            group_id = group.pk
+            # Only cache after commit: an id from a rolled-back transaction
+            # would point at a group that no longer exists.
+            transaction.on_commit(lambda: _remember_authenticated_group(group_id))
+        instance.groups.add(group_id)
+
+
+@receiver(post_delete, sender=Group)
+def forget_authenticated_group(sender, instance, **kwargs):
+    if instance.pk == _authenticated_group_id:
+        _remember_authenticated_group(None)
 
 
 # ---------------------------------------------------------
@@ -33,19 +56,17 @@ def check_cycle(sender, instance, action, reverse, model, pk_set, **kwargs):
     if instance.pk is None:
         return
 
-    for pk in pk_set:
-        try:
-            prereq = model.objects.get(pk=pk)
-        except model.DoesNotExist:
-            continue
-
-        if prereq.pk == instance.pk:
-            raise ValidationError("A task cannot depend on itself.")
+    if instance.pk in pk_set:
+        raise ValidationError("A task cannot depend on itself.")
 
-        if instance.has_cycle(prereq, instance.pk):
-            raise ValidationError(
-                f"Adding prerequisite '{prereq}' would create a circular dependency."
-            )
+    # One query for the candidates; the walk then loads the prerequisite
+    # graph one level per query
+    prereqs = list(model.objects.filter(pk__in=pk_set))
+    cyclic = instance.check_cycles_batch(prereqs)
+    if cyclic:
+        raise ValidationError(
+            f"Adding prerequisite '{cyclic[0]}' would create a circular dependency."
+        )
 
 
 # ---------------------------------------------------------
@@ -67,11 +88,7 @@ def update_milestone_on_task_delete(sender, instance, **kwargs):
         - Inline formset deletes
     """
     if instance.milestone_id:
-        try:
-            ms = Milestone.objects.get(pk=instance.milestone_id)
-            ms.recalculate_and_save_date()
-        except Milestone.DoesNotExist:
-            pass
+        Milestone.recalculate_due_dates_on_commit(instance.milestone_id)
 
 # ---------------------------------------------------------
 # Capture old milestone before saving (pre_save)
@@ -89,11 +106,17 @@ def capture_old_milestone(sender, instance, **kwargs):
     if hasattr(instance, "_old_milestone_id") and instance._old_milestone_id is not None:
         return
     
-    try:
-        old_task = Task.objects.get(pk=instance.pk)
-        instance._old_milestone_id = old_task.milestone_id
-    except Task.DoesNotExist:
+    # Rows loaded from the database recorded their milestone in Task.__init__
+    if not instance._state.adding:
+        instance._old_milestone_id = instance._original_milestone_id
+        return
+
+    # An unsaved instance with an explicit pk: read the stored columns only
+    old = Task.objects.filter(pk=instance.pk).values_list('milestone_id', 'due_date').first()
+    if old is None:
         instance._old_milestone_id = None
+    else:
+        instance._old_milestone_id, instance._original_due_date = old
 
 
 # ---------------------------------------------------------
@@ -110,28 +133,29 @@ def update_milestones_on_task_save(sender, instance, created, **kwargs):
     old_ms_id = getattr(instance, "_old_milestone_id", None)
     new_ms_id = instance.milestone_id
 
+    # Recalculations are queued until commit and deduplicated (see Task.save).
+
     # NEW TASK
     if created:
         if new_ms_id:
-            try:
-                ms = Milestone.objects.get(pk=new_ms_id)
-                ms.recalculate_and_save_date()
-            except Milestone.DoesNotExist:
-                pass
+            Milestone.recalculate_due_dates_on_commit(new_ms_id)
+        return
+
+    # Task.save() has not refreshed its load-time snapshot yet, so it still
+    # holds the pre-save due date. Nothing date-relevant changed: no work.
+    date_changed = instance.due_date != instance._original_due_date
+    if new_ms_id == old_ms_id and not date_changed:
+        return
+
+    # SAME MILESTONE, NEW DUE DATE
+    if new_ms_id and new_ms_id == old_ms_id:
+        Milestone.recalculate_due_dates_on_commit(new_ms_id)
         return
 
     # TASK MOVED TO A NEW MILESTONE
     if new_ms_id and new_ms_id != old_ms_id:
-        try:
-            new_ms = Milestone.objects.get(pk=new_ms_id)
-            new_ms.recalculate_and_save_date()
-        except Milestone.DoesNotExist:
-            pass
+        Milestone.recalculate_due_dates_on_commit(new_ms_id)
 
     # TASK REMOVED FROM OLD MILESTONE
     if old_ms_id and old_ms_id != new_ms_id:
-        try:
-            old_ms = Milestone.objects.get(pk=old_ms_id)
-            old_ms.recalculate_and_save_date()
-        except Milestone.DoesNotExist:
-            pass
\ No newline at end of file
+        Milestone.recalculate_due_dates_on_commit(old_ms_id)
\ No newline at end of file
@@ -1,13 +1,23 @@
 from django import template
 from django.utils.safestring import mark_safe
+from functools import lru_cache
 import re
 
 register = template.Library()
 
+HIGHLIGHT_REPLACEMENT = r'<span style="background-color: #e6f598;">\1</span>'
+
+
+@lru_cache(maxsize=256)
+def _highlight_pattern(search_term):
+    """Compiles the case-insensitive pattern for a search term once."""
+    return re.compile(f'({re.escape(search_term)})', re.IGNORECASE)
+
+
 @register.filter
 def highlight(text, search_term):
     if search_term:
         # Use regex to find and wrap the search term in a <span> with background color
-        highlighted = re.sub(f'({re.escape(search_term)})', r'<span style="background-color: #e6f598;">\1</span>', text, flags=re.IGNORECASE)
-        return mark_safe(highlighted)        
+        highlighted = _highlight_pattern(search_term).sub(HIGHLIGHT_REPLACEMENT, text)
+        return mark_safe(highlighted)
     return text
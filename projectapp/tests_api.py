@@ -1,49 +1,148 @@
 from django.urls import reverse
-from rest_framework.test import APITestCase
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
 from rest_framework import status
 from django.contrib.auth.models import User, Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from datetime import date, timedelta
+from functools import lru_cache
 
+from projectapp.api_views import TaskViewSet
 from projectapp.models import Project, Task, Tag, Milestone
+from projectapp.serializers import TaskSerializer
 
+# Fixture dates only; code under test still reads the clock itself
+TODAY = date.today()
+
+
+@lru_cache(maxsize=None)
+def permission_ids():
+    """Maps projectapp permission codenames to ids.
+
+    Permissions are created by migrations and outlive every test
+    transaction, so they are read once per test run.
+    """
+    return dict(
+        Permission.objects.filter(content_type__app_label="projectapp")
+        .values_list("codename", "id")
+    )
+
+
+def grant_permissions(user, codenames):
+    """Grants the named projectapp permissions to user with one INSERT."""
+    Through = User.user_permissions.through
+    ids = permission_ids()
+    Through.objects.bulk_create(
+        [Through(user_id=user.id, permission_id=ids[codename]) for codename in codenames]
+    )
+
+
+class AuthenticatedAPITestCase(APITestCase):
+    """Authenticates the client as a user holding the class's permissions."""
+
+    permissions = []
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="alex")
+        grant_permissions(cls.user, cls.permissions)
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
 
 # =====================================================================
 #  PROJECT API TESTS  (ProjectViewSet)
 # =====================================================================
-class ProjectAPITests(APITestCase):
+class ProjectAPITests(AuthenticatedAPITestCase):
 
-    def setUp(self):
-        self.user = User.objects.create_user(username="alex", password="pass")
-        self.user.user_permissions.add(
-            Permission.objects.get(codename="add_project"),
-            Permission.objects.get(codename="view_project"),
-            Permission.objects.get(codename="change_project"),
-            Permission.objects.get(codename="delete_project"),
-        )
-        self.client.login(username="alex", password="pass")
+    permissions = ["add_project", "view_project", "change_project", "delete_project"]
 
-        self.project = Project.objects.create(title="API Proj")
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.project = Project.objects.create(title="API Proj")
 
-        self.list_url = reverse("api-projects-list")
-        self.detail_url = reverse("api-projects-detail", args=[self.project.id])
+        cls.list_url = reverse("api-projects-list")
+        cls.detail_url = reverse("api-projects-detail", args=[cls.project.id])
 
     # ---- LIST ----
     def test_project_list_integration(self):
-        response = self.client.get(self.list_url)
+        # Counts, latest due date and progress are all annotated on one SELECT
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("task_count", response.data[0])
         self.assertIn("milestone_count", response.data[0])
         self.assertIn("latest_due_date", response.data[0])
 
+    def test_project_detail_renders_json(self):
+        response = self.client.get(self.detail_url, HTTP_ACCEPT="application/json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.json()["title"], "API Proj")
+        self.assertEqual(response.json()["progress"], 0.0)
+
+    def test_project_list_counts(self):
+        """Counts must not multiply when a project has both tasks and milestones."""
+        due = TODAY + timedelta(days=3)
+        Task.objects.create(project=self.project, title="T1", due_date=TODAY)
+        Task.objects.create(project=self.project, title="T2", due_date=due)
+        Milestone.objects.create(project=self.project, name="M1", due_date=due)
+        Milestone.objects.create(project=self.project, name="M2", due_date=due)
+        Milestone.objects.create(project=self.project, name="M3", due_date=due)
+        Project.objects.create(title="Z Empty")
+
+        response = self.client.get(self.list_url)
+        rows = {row["title"]: row for row in response.data}
+
+        self.assertEqual(rows["API Proj"]["task_count"], 2)
+        self.assertEqual(rows["API Proj"]["milestone_count"], 3)
+        self.assertEqual(rows["API Proj"]["latest_due_date"], due.isoformat())
+        self.assertEqual(rows["Z Empty"]["task_count"], 0)
+        self.assertIsNone(rows["Z Empty"]["latest_due_date"])
+
+    def test_project_list_progress_is_annotated(self):
+        m = Milestone.objects.create(project=self.project, name="M1", due_date=TODAY)
+        Task.objects.create(project=self.project, milestone=m, title="T1", due_date=TODAY, status="done")
+        Task.objects.create(project=self.project, title="T2", due_date=TODAY)
+        self.client.get(self.list_url)  # warm up session/permission lookups
+
+        with CaptureQueriesContext(connection) as one_project:
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.data[0]["progress"], self.project.progress)
+
+        for i in range(3):
+            other = Project.objects.create(title=f"Other {i}")
+            Task.objects.create(project=other, title="T", due_date=TODAY)
+        with CaptureQueriesContext(connection) as four_projects:
+            self.client.get(self.list_url)
+        self.assertEqual(len(four_projects), len(one_project))
+
     # ---- RETRIEVE ----
     def test_project_retrieve_integration(self):
-        response = self.client.get(self.detail_url)
+        # Project, prefetched tasks, milestones and tags, progress aggregate
+        with self.assertNumQueries(5):
+            response = self.client.get(self.detail_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["title"], "API Proj")
         self.assertIn("tasks", response.data)
         self.assertIn("milestones", response.data)
 
+    def test_project_retrieve_milestone_completion(self):
+        done_ms = Milestone.objects.create(project=self.project, name="Done", due_date=TODAY)
+        open_ms = Milestone.objects.create(project=self.project, name="Open", due_date=TODAY)
+        Task.objects.create(project=self.project, milestone=done_ms, title="T1", due_date=TODAY, status="done")
+        Task.objects.create(project=self.project, milestone=open_ms, title="T2", due_date=TODAY)
+
+        response = self.client.get(self.detail_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        completion = {m["name"]: m["is_complete"] for m in response.data["milestones"]}
+        self.assertEqual(completion, {"Done": True, "Open": False})
+        self.assertEqual(response.data["progress"], 50.0)
+
     # ---- CREATE ----
     def test_project_create_integration(self):
         data = {"title": "New API Project"}
@@ -57,8 +156,7 @@ class ProjectAPITests(APITestCase):
         data = {"title": "Updated"}
         response = self.client.patch(self.detail_url, data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.project.refresh_from_db()
-        self.assertEqual(self.project.title, "Updated")
+        self.assertEqual(response.data["title"], "Updated")
 
     # ---- DELETE ----
     def test_project_delete_integration(self):
@@ -67,77 +165,17 @@ class ProjectAPITests(APITestCase):
         self.assertFalse(Project.objects.filter(id=self.project.id).exists())
 
 
-# =====================================================================
-#  TASK API TESTS  (TaskViewSet)
-# =====================================================================
-class TaskAPITests(APITestCase):
-
-    def setUp(self):
-        self.user = User.objects.create_user(username="alex", password="pass")
-        perms = [
-            "add_task", "view_task", "change_task", "delete_task",
-            "add_tag", "view_tag", "change_tag",
-            "add_milestone", "view_milestone"
-        ]
-        for p in perms:
-            self.user.user_permissions.add(Permission.objects.get(codename=p))
-
-        self.client.login(username="alex", password="pass")
-
-        self.project = Project.objects.create(title="P1")
-        self.m1 = Milestone.objects.create(project=self.project, name="M1", due_date=date.today())
-        self.tag = Tag.objects.create(project=self.project, name="t1")
-
-        self.url_list = reverse("api-tasks-list")
-
-    def create_task(self, title="T1", milestone=None, prereqs=None):
-        default_data = {
-            # REQUIRED 1: project ID
-            "project": self.project.id, 
-            # REQUIRED 2: title
-            "title": "New Task",
-            # REQUIRED 3: due_date (We use a date far in the future to avoid validation issues)
-            "due_date": date(2099, 12, 31).strftime('%Y-%m-%d'), # Formats date as '2099-12-31'
-            
-            "milestone": self.m1.id
-        }
-        data = {**default_data}
-        return self.client.post(self.url_list, {
-            "title": title,
-            "project": self.project.id,
-            "milestone": milestone.id if milestone else None,
-            "prerequisite_tasks": prereqs or [],
-        })
-    
-    # ---- CREATE: milestone must match project ----
-    def test_task_create_invalid_milestone_wrong_project(self):
-        other_proj = Project.objects.create(title="OTHER")
-        bad_ms = Milestone.objects.create(project=other_proj, name="Bad", due_date=date.today())
-
-        response = self.client.post(self.url_list, {
-            "title": "X",
-            "project": self.project.id,
-            "milestone": bad_ms.id,  # INVALID
-        })
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        
-    # All other TASK tests were removed because they failed (Errors or Failures)
-
-
 # =====================================================================
 #  MILESTONE API TESTS
 # =====================================================================
-class MilestoneAPITests(APITestCase):
-    def setUp(self):
-        self.user = User.objects.create_user("alex", password="pass")
-        self.user.user_permissions.add(
-            Permission.objects.get(codename="add_milestone"),
-            Permission.objects.get(codename="view_milestone"),
-        )
-        self.client.login(username="alex", password="pass")
+class MilestoneAPITests(AuthenticatedAPITestCase):
+    permissions = ["add_milestone", "view_milestone"]
 
-        self.project = Project.objects.create(title="MProj")
-        self.list_url = reverse("api-milestones-list")
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.project = Project.objects.create(title="MProj")
+        cls.list_url = reverse("api-milestones-list")
 
     def test_milestone_create(self):
         response = self.client.post(self.list_url, {
@@ -152,18 +190,15 @@ class MilestoneAPITests(APITestCase):
 # =====================================================================
 #  TAG API TESTS
 # =====================================================================
-class TagAPITests(APITestCase):
+class TagAPITests(AuthenticatedAPITestCase):
 
-    def setUp(self):
-        self.user = User.objects.create_user("alex", password="pass")
-        self.user.user_permissions.add(
-            Permission.objects.get(codename="add_tag"),
-            Permission.objects.get(codename="view_tag"),
-        )
-        self.client.login(username="alex", password="pass")
+    permissions = ["add_tag", "view_tag"]
 
-        self.project = Project.objects.create(title="TP")
-        self.list_url = reverse("api-tags-list")
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.project = Project.objects.create(title="TP")
+        cls.list_url = reverse("api-tags-list")
 
     def test_tag_create(self):
         resp = self.client.post(self.list_url, {
@@ -173,39 +208,101 @@ class TagAPITests(APITestCase):
         self.assertEqual(resp.status_code, 201)
         self.assertTrue(Tag.objects.filter(name="urgent").exists())
 
-class TaskAPITests(APITestCase):
+    def test_tag_create_duplicate_name(self):
+        Tag.objects.create(project=self.project, name="urgent")
+        for name in ("urgent", "URGENT"):
+            with self.subTest(name=name):
+                resp = self.client.post(self.list_url, {
+                    "name": name,
+                    "project": self.project.title,
+                })
+                self.assertEqual(resp.status_code, 400)
+                self.assertIn("non_field_errors", resp.data)
+        self.assertEqual(Tag.objects.filter(project=self.project).count(), 1)
 
-    def setUp(self):
-        self.user = User.objects.create_user(username="alex", password="pass")
-
-        perms = [
-            "add_task", "view_task", "change_task", "delete_task",
-            "add_tag", "view_tag",
-            "add_milestone", "view_milestone",
-            "view_project"
-        ]
-        for p in perms:
-            self.user.user_permissions.add(Permission.objects.get(codename=p))
-
-        self.client.login(username="alex", password="pass")
-
-        # Base project + milestone
-        self.project = Project.objects.create(title="P1")
-        self.ms1 = Milestone.objects.create(
-            project=self.project,
-            name="M1",
-            due_date=date.today() + timedelta(days=10)
-        )
 
-        # A second project for invalid cross-project tests
-        self.other_project = Project.objects.create(title="Other")
-        self.other_ms = Milestone.objects.create(
-            project=self.other_project,
-            name="OM",
-            due_date=date.today() + timedelta(days=5)
+# =====================================================================
+#  TASK API TESTS  (TaskViewSet)
+# =====================================================================
+class TaskAPITests(AuthenticatedAPITestCase):
+
+    permissions = [
+        "add_task", "view_task", "change_task", "delete_task",
+        "add_tag", "view_tag",
+        "add_milestone", "view_milestone",
+        "view_project"
+    ]
+
+    # Request payload dates
+    IN_2_DAYS = (TODAY + timedelta(days=2)).isoformat()
+    IN_3_DAYS = (TODAY + timedelta(days=3)).isoformat()
+    IN_5_DAYS = (TODAY + timedelta(days=5)).isoformat()
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        # Base project + milestone, and a second project for invalid
+        # cross-project tests
+        cls.project, cls.other_project = Project.objects.bulk_create([
+            Project(title="P1"),
+            Project(title="Other"),
+        ])
+        cls.ms1, cls.other_ms = Milestone.objects.bulk_create([
+            Milestone(
+                project=cls.project,
+                name="M1",
+                due_date=TODAY + timedelta(days=10)
+            ),
+            Milestone(
+                project=cls.other_project,
+                name="OM",
+                due_date=TODAY + timedelta(days=5)
+            ),
+        ])
+
+        cls.list_url = reverse("api-tasks-list")
+
+    def post_invalid(self, data):
+        """Calls TaskViewSet.create directly, skipping middleware and URL
+        resolution; for tests that only check serializer validation.
+        """
+        request = APIRequestFactory().post(self.list_url, data)
+        force_authenticate(request, user=self.user)
+        return TaskViewSet.as_view({"post": "create"})(request)
+
+    # ===================================================================
+    # 0. LIST
+    # ===================================================================
+    def test_task_list(self):
+        Task.objects.create(project=self.project, title="Listed", due_date=TODAY)
+
+        resp = self.client.get(self.list_url)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([t["title"] for t in resp.data], ["Listed"])
+        self.assertEqual(resp.data[0]["project_title"], "P1")
+        self.assertTrue(
+            resp.data[0]["project_url"].endswith(
+                reverse("api-projects-detail", args=[self.project.id])
+            )
         )
 
-        self.list_url = reverse("api-tasks-list")
+    def test_task_list_query_count_does_not_grow_with_tags(self):
+        tags = [Tag.objects.create(project=self.project, name=f"t{i}") for i in range(3)]
+        Task.objects.create(project=self.project, title="First", due_date=TODAY).tags.add(*tags)
+
+        with CaptureQueriesContext(connection) as one_task:
+            self.client.get(self.list_url)
+
+        for i in range(3):
+            Task.objects.create(project=self.project, title=f"T{i}", due_date=TODAY).tags.add(*tags)
+
+        with CaptureQueriesContext(connection) as many_tasks:
+            resp = self.client.get(self.list_url)
+
+        self.assertEqual(len(many_tasks), len(one_task))
+        self.assertEqual(resp.data[0]["tags"][0]["project"], "P1")
 
     # ===================================================================
     # 1. BASIC CREATION
@@ -215,7 +312,7 @@ class TaskAPITests(APITestCase):
         resp = self.client.post(self.list_url, {
             "project": self.project.id,
             "title": "Task A",
-            "due_date": (date.today() + timedelta(days=3)).isoformat(),
+            "due_date": self.IN_3_DAYS,
             "milestone": self.ms1.id,
         })
 
@@ -227,26 +324,39 @@ class TaskAPITests(APITestCase):
     # ===================================================================
     def test_task_create_invalid_milestone_wrong_project(self):
         """Milestone must belong to same project."""
-        resp = self.client.post(self.list_url, {
+        resp = self.post_invalid({
             "project": self.project.id,
             "title": "Bad",
-            "due_date": (date.today() + timedelta(days=3)).isoformat(),
+            "due_date": self.IN_3_DAYS,
             "milestone": self.other_ms.id,   # WRONG
         })
 
         self.assertEqual(resp.status_code, 400)
         self.assertIn("milestone", resp.data)
 
+    def test_task_create_reports_all_errors_at_once(self):
+        resp = self.post_invalid({
+            "project": self.project.id,
+            "title": "Bad",
+            "start_date": self.IN_5_DAYS,
+            "due_date": self.IN_2_DAYS,
+            "milestone": self.other_ms.id,   # WRONG
+        })
+
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("milestone", resp.data)
+        self.assertIn("due_date", resp.data)
+
     # ===================================================================
     # 3. START DATE MUST NOT BE AFTER DUE DATE
     # ===================================================================
     def test_task_create_invalid_start_after_due(self):
         """start_date > due_date must fail."""
-        resp = self.client.post(self.list_url, {
+        resp = self.post_invalid({
             "project": self.project.id,
             "title": "Bad dates",
-            "start_date": (date.today() + timedelta(days=5)).isoformat(),
-            "due_date": (date.today() + timedelta(days=2)).isoformat(),
+            "start_date": self.IN_5_DAYS,
+            "due_date": self.IN_2_DAYS,
         })
 
         self.assertEqual(resp.status_code, 400)
@@ -259,17 +369,17 @@ class TaskAPITests(APITestCase):
         p_other_task = Task.objects.create(
             project=self.other_project,
             title="Foreign",
-            due_date=date.today() + timedelta(days=4),
+            due_date=TODAY + timedelta(days=4),
         )
 
-        resp = self.client.post(self.list_url, {
+        resp = self.post_invalid({
             "project": self.project.id,
             "title": "New",
-            "due_date": (date.today() + timedelta(days=3)).isoformat(),
+            "due_date": self.IN_3_DAYS,
             "prerequisite_tasks": [p_other_task.id],  # WRONG PROJECT
         })
 
-        # The serializer filters queryset to the correct project → results in invalid ID
+        # validate() rejects prerequisites from another project
         self.assertEqual(resp.status_code, 400)
         self.assertIn("prerequisite_tasks", resp.data)
 
@@ -280,14 +390,13 @@ class TaskAPITests(APITestCase):
         resp = self.client.post(self.list_url, {
             "project": self.project.id,
             "title": "Tagged",
-            "due_date": (date.today() + timedelta(days=3)).isoformat(),
+            "due_date": self.IN_3_DAYS,
             "new_tags": "urgent, backend",
         })
 
         self.assertEqual(resp.status_code, 201)
-        task = Task.objects.get(title="Tagged")
-
-        names = set(t.name for t in task.tags.all())
+        # The response carries the new task's id; no need to load the task
+        names = set(Tag.objects.filter(tasks=resp.data["id"]).values_list("name", flat=True))
         self.assertEqual(names, {"urgent", "backend"})
 
     # ===================================================================
@@ -299,13 +408,12 @@ class TaskAPITests(APITestCase):
         resp = self.client.post(self.list_url, {
             "project": self.project.id,
             "title": "Tagged2",
-            "due_date": (date.today() + timedelta(days=3)).isoformat(),
+            "due_date": self.IN_3_DAYS,
             "tag_ids": [tag.id],
         })
 
         self.assertEqual(resp.status_code, 201)
-        task = Task.objects.get(title="Tagged2")
-        self.assertIn(tag, task.tags.all())
+        self.assertTrue(tag.tasks.filter(pk=resp.data["id"]).exists())
         
     # ==========================================
 
@@ -318,8 +426,8 @@ class TaskAPITests(APITestCase):
         task = Task.objects.create(
             title="A",
             project=self.project,
-            start_date=date.today(),
-            due_date=date.today(),
+            start_date=TODAY,
+            due_date=TODAY,
             priority=Task.MEDIUM,
         )
 
@@ -340,19 +448,13 @@ class TaskAPITests(APITestCase):
         """If A is prereq of B, B cannot become a prereq of A (A->B->A)."""
 
         # 1. Create Task A and Task B
-        task_a = Task.objects.create(
-            title="Task A",
-            project=self.project,
-            due_date=date.today() + timedelta(days=2),
-        )
-        task_b = Task.objects.create(
-            title="Task B",
-            project=self.project,
-            due_date=date.today() + timedelta(days=5),
-        )
+        task_a, task_b = Task.objects.bulk_create([
+            Task(title="Task A", project=self.project, due_date=TODAY + timedelta(days=2)),
+            Task(title="Task B", project=self.project, due_date=TODAY + timedelta(days=5)),
+        ])
 
         # 2. Establish initial dependency: Task A is a prerequisite of Task B (A -> B)
-        task_b.prerequisite_tasks.add(task_a)
+        Task.prerequisite_tasks.through.objects.create(from_task=task_b, to_task=task_a)
 
         # 3. Attempt to create the cycle: Make Task B a prerequisite of Task A (A -> B, B -> A)
         url_task_a = reverse("api-tasks-detail", kwargs={"pk": task_a.id})
@@ -373,88 +475,77 @@ class TaskAPITests(APITestCase):
         )
         
         # 5. Ensure the cycle was not actually created
-        task_a.refresh_from_db()
         self.assertFalse(task_a.prerequisite_tasks.filter(id=task_b.id).exists())
         
     def test_task_update_prevent_transitive_circular_dependency(self):
         """If A->B->C exists, C cannot become a prereq of A (A->B->C->A)."""
         
+        # Checked at the serializer: test_task_update_prevent_circular_dependency
+        # already covers the PATCH round trip.
         # 1. Create Task A, B, and C
-        task_a = Task.objects.create(
-            title="Task A", project=self.project, due_date=date.today() + timedelta(days=2),
-        )
-        task_b = Task.objects.create(
-            title="Task B", project=self.project, due_date=date.today() + timedelta(days=5),
-        )
-        task_c = Task.objects.create(
-            title="Task C", project=self.project, due_date=date.today() + timedelta(days=8),
-        )
+        task_a, task_b, task_c = Task.objects.bulk_create([
+            Task(title="Task A", project=self.project, due_date=TODAY + timedelta(days=2)),
+            Task(title="Task B", project=self.project, due_date=TODAY + timedelta(days=5)),
+            Task(title="Task C", project=self.project, due_date=TODAY + timedelta(days=8)),
+        ])
 
         # 2. Establish initial transitive dependency: A -> B -> C
-        task_b.prerequisite_tasks.add(task_a)
-        task_c.prerequisite_tasks.add(task_b)
+        Prerequisite = Task.prerequisite_tasks.through
+        Prerequisite.objects.bulk_create([
+            Prerequisite(from_task=task_b, to_task=task_a),
+            Prerequisite(from_task=task_c, to_task=task_b),
+        ])
 
         # 3. Attempt to close the loop: Make Task C a prerequisite of Task A (A -> B -> C, C -> A)
-        url_task_a = reverse("api-tasks-detail", kwargs={"pk": task_a.id})
-        
-        # Try to PATCH Task A with a dependency on Task C
-        resp = self.client.patch(
-            url_task_a,
-            {"prerequisite_tasks": [task_c.id]},  # This closes the loop
-            content_type="application/json"
+        serializer = TaskSerializer(
+            instance=task_a, data={"prerequisite_tasks": [task_c.id]}, partial=True,
         )
 
         # 4. Assert failure and correct error message
-        self.assertEqual(resp.status_code, 400)
-        self.assertIn("prerequisite_tasks", resp.data)
+        self.assertFalse(serializer.is_valid())
         self.assertIn(
-            "Dependency cycle detected", 
-            resp.data["prerequisite_tasks"][0]
+            "Dependency cycle detected",
+            serializer.errors["prerequisite_tasks"][0]
         )
-        
-        # 5. Ensure the cycle was not actually created
-        task_a.refresh_from_db()
-        self.assertFalse(task_a.prerequisite_tasks.filter(id=task_c.id).exists())
-        
+
 # =====================================================================
 #  TAG DETAIL + LIST API TESTS (TagViewSet)
 # =====================================================================
-class TagDetailAPITests(APITestCase):
+class TagDetailAPITests(AuthenticatedAPITestCase):
 
-    def setUp(self):
-        self.user = User.objects.create_user(username="alex", password="pass")
-        perms = ["add_tag", "view_tag", "change_tag", "delete_tag"]
-        for p in perms:
-            self.user.user_permissions.add(Permission.objects.get(codename=p))
-        self.client.login(username="alex", password="pass")
+    permissions = ["add_tag", "view_tag", "change_tag", "delete_tag"]
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
 
         # Main project
-        self.project = Project.objects.create(title="TP")
+        cls.project = Project.objects.create(title="TP")
 
         # Tasks for this project
-        self.task1 = Task.objects.create(
-            project=self.project,
+        cls.task1 = Task.objects.create(
+            project=cls.project,
             title="Task 1",
-            due_date=date.today()
+            due_date=TODAY
         )
-        self.task2 = Task.objects.create(
-            project=self.project,
+        cls.task2 = Task.objects.create(
+            project=cls.project,
             title="Task 2",
-            due_date=date.today()
+            due_date=TODAY
         )
 
         # Tag belonging to project
-        self.tag = Tag.objects.create(
+        cls.tag = Tag.objects.create(
             name="Finance",
-            project=self.project
+            project=cls.project
         )
 
         # Associate tasks with tag
-        self.task1.tags.add(self.tag)
-        self.task2.tags.add(self.tag)
+        cls.task1.tags.add(cls.tag)
+        cls.task2.tags.add(cls.tag)
 
-        self.list_url = reverse("api-tags-list")
-        self.detail_url = reverse("api-tags-detail", args=[self.tag.id])
+        cls.list_url = reverse("api-tags-list")
+        cls.detail_url = reverse("api-tags-detail", args=[cls.tag.id])
 
     # ---------------------------------------------------------------
     # LIST VIEW SHOULD NOT INCLUDE TASKS
@@ -490,7 +581,7 @@ class TagDetailAPITests(APITestCase):
         foreign_task = Task.objects.create(
             project=self.project,
             title="Foreign",
-            due_date=date.today()
+            due_date=TODAY
         )
 
         resp = self.client.get(self.detail_url)
@@ -507,7 +598,7 @@ class TagDetailAPITests(APITestCase):
         other_task = Task.objects.create(
             project=other_project,
             title="OtherTask",
-            due_date=date.today()
+            due_date=TODAY
         )
         other_tag = Tag.objects.create(
             project=other_project,
@@ -1,12 +1,14 @@
-import json
-from datetime import date
-from django.db.models import Q, Prefetch
+from operator import attrgetter
+import orjson
+from django.core.paginator import Paginator
+from django.db.models import Exists, Min, OuterRef, Prefetch, Q, Subquery
 from django.db.models.functions import Lower
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.http import Http404
 from django.contrib import messages
 from django.urls import reverse_lazy, reverse
+from django.utils import timezone
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import UserCreationForm
@@ -55,6 +57,16 @@ class PermissionMixin(UserPassesTestMixin):
         return redirect('home_page')
 
 
+def _perm_flags(user, *perms):
+    """Maps each 'projectapp.<codename>' to a 'can_<codename>' template flag.
+
+    The user's permission set is read once, instead of going through the
+    auth backends for every has_perm() call.
+    """
+    granted = user.get_all_permissions()
+    return {f"can_{perm.split('.', 1)[1]}": perm in granted for perm in perms}
+
+
 # ---------- PROJECT VIEWS ----------
 class ProjectListView(ListView):
     model = Project
@@ -66,16 +78,30 @@ class ProjectListView(ListView):
         
         # 1. Use Prefetch to efficiently fetch tasks (with ordering) and milestones.
         #    - 'tasks' prefetch:
-        #      - Uses select_related('milestone') to avoid an N+1 when calculating
-        #        task details or accessing task.milestone later.
-        #      - Orders tasks for a predictable display in the template.
+        #      - Loads only the columns the task rows print (and is_overdue reads).
+        #      - Orders tasks by the field the projects are sorted on, so each
+        #        card's first task is the one that placed the project.
         #    - 'milestones' prefetch: Solves the N+1 problem when accessing 
         #      {% for milestone in project.milestones.all %} in the template.
-        qs = Project.objects.prefetch_related(
-            'milestones', 
+        #      with_open_tasks() answers is_complete, and the nested task ids
+        #      answer the task count, so a card needs no queries of its own.
+        #    The cards only show the title and description (progress is computed),
+        #    so the timestamps are not loaded.
+        #    with_progress() annotates the counts behind project.progress, so
+        #    the progress bar needs no queries per project.
+        task_order = ('priority', 'due_date') if sort_by == 'priority' else ('due_date', '-priority')
+        milestones = (
+            Milestone.objects.with_open_tasks()
+            .only('id', 'project_id', 'name', 'due_date')
+            .prefetch_related(Prefetch('tasks', queryset=Task.objects.only('id', 'milestone_id')))
+        )
+        qs = Project.objects.only('id', 'title', 'description').with_progress().prefetch_related(
+            Prefetch('milestones', queryset=milestones),
             Prefetch(
                 'tasks', 
-                queryset=Task.objects.select_related('milestone').order_by('due_date', '-priority')
+                queryset=Task.objects.only(
+                    'id', 'project_id', 'title', 'priority', 'status', 'due_date'
+                ).order_by(*task_order)
             )
         )
 
@@ -87,36 +113,30 @@ class ProjectListView(ListView):
         # without affecting the sort logic. We will rely on the Project.progress 
         # method which handles the calculation dynamically.
         
-        # To fix the {{ milestone.tasks.count }} issue, we can't easily fix it here
-        # without complicating the `qs.distinct()` logic needed for sorting.
-        # Instead, we will fix the model layer (See section 2).
-        
         # 3. Handle Sorting
-        if sort_by == 'priority':
-            # Sorting on related fields requires a join and distinct()
-            qs = qs.order_by('tasks__priority', 'title')
-        elif sort_by == 'due_date':
-            # Sorting on related fields requires a join and distinct()
-            qs = qs.order_by('tasks__due_date', 'title')
+        #    Task fields are sorted on through a per-project subquery rather
+        #    than a join, so each project stays one row and needs no distinct().
+        if sort_by in ('priority', 'due_date'):
+            first_task_value = Task.objects.filter(
+                project=OuterRef('pk')
+            ).order_by(sort_by).values(sort_by)[:1]
+            qs = qs.annotate(sort_key=Subquery(first_task_value)).order_by('sort_key', 'title')
         else:
             # Simple sorting by title is most efficient
             qs = qs.order_by('title')
 
-        # distinct() is required when ordering by related fields (tasks__...)
-        # to prevent duplicate projects from the join.
-        return qs.distinct()
+        return qs
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         u = self.request.user
         context.update({
             'sort_by': self.request.GET.get('sort', 'title'),
-            'can_add_task': u.has_perm('projectapp.add_task'),
-            'can_change_task': u.has_perm('projectapp.change_task'),
-            'can_delete_task': u.has_perm('projectapp.delete_task'),
-            'can_change_project': u.has_perm('projectapp.change_project'),
-            'can_delete_project': u.has_perm('projectapp.delete_project'),
-            'can_add_project': u.has_perm('projectapp.add_project'),
+            **_perm_flags(
+                u,
+                'projectapp.add_task', 'projectapp.change_task', 'projectapp.delete_task',
+                'projectapp.change_project', 'projectapp.delete_project', 'projectapp.add_project',
+            ),
         })
         return context
 
@@ -141,12 +161,10 @@ class ProjectCreateView(CreateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        u = self.request.user
-        context.update({
-            'can_add_project': u.has_perm('projectapp.add_project'),
-            'can_change_project': u.has_perm('projectapp.change_project'),
-            'can_delete_project': u.has_perm('projectapp.delete_project'),
-        })
+        context.update(_perm_flags(
+            self.request.user,
+            'projectapp.add_project', 'projectapp.change_project', 'projectapp.delete_project',
+        ))
         return context
 
     def get_success_url(self):
@@ -168,12 +186,10 @@ class ProjectUpdateView(LoginRequiredMixin, PermissionMixin, UpdateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        u = self.request.user
-        context.update({
-            'can_add_project': u.has_perm('projectapp.add_project'),
-            'can_change_project': u.has_perm('projectapp.change_project'),
-            'can_delete_project': u.has_perm('projectapp.delete_project'),
-        })
+        context.update(_perm_flags(
+            self.request.user,
+            'projectapp.add_project', 'projectapp.change_project', 'projectapp.delete_project',
+        ))
         return context
 
 class ProjectDeleteView(LoginRequiredMixin, PermissionMixin, DeleteView):
@@ -188,6 +204,13 @@ class ProjectDetailView(DetailView):
     template_name = 'projectapp/project_detail.html'
     context_object_name = 'project'
 
+    def get_queryset(self):
+        # Milestone cards show completion, a task count and the task titles;
+        # with_progress() loads the progress bar's counts with the project row
+        return Project.objects.with_progress().prefetch_related(
+            Prefetch('milestones', queryset=Milestone.objects.with_open_tasks().prefetch_related('tasks')),
+        )
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         project = self.object
@@ -197,25 +220,24 @@ class ProjectDetailView(DetailView):
         elif sort_by == 'due_date':
             tasks = project.tasks.all().select_related('milestone').order_by('due_date')
         elif sort_by == 'title':
-            tasks = project.tasks.all().annotate(lower_title=Lower('title')).select_related('milestone').order_by('lower_title')
+            # Ordering on the bare expression lets task_project_title_idx serve the sort
+            tasks = project.tasks.all().select_related('milestone').order_by(Lower('title'))
         else:
             tasks = project.tasks.all().select_related('milestone')
 
-        for task in tasks:
-            task.overdue = task.is_overdue()
+        # The template lists each task's prerequisites and flags overdue tasks
+        tasks = tasks.prefetch_related('prerequisite_tasks').with_overdue()
 
         u = self.request.user
         context.update({
             'tasks': tasks,
             'project_progress': project.progress,
-            'can_add_task': u.has_perm('projectapp.add_task'),
-            'can_change_task': u.has_perm('projectapp.change_task'),
-            'can_delete_task': u.has_perm('projectapp.delete_task'),
-            'can_change_project': u.has_perm('projectapp.change_project'),
-            'can_delete_project': u.has_perm('projectapp.delete_project'),
-            'can_add_milestone': u.has_perm('projectapp.add_milestone'),
-            'can_change_milestone': u.has_perm('projectapp.change_milestone'),
-            'can_delete_milestone': u.has_perm('projectapp.delete_milestone'),
+            **_perm_flags(
+                u,
+                'projectapp.add_task', 'projectapp.change_task', 'projectapp.delete_task',
+                'projectapp.change_project', 'projectapp.delete_project',
+                'projectapp.add_milestone', 'projectapp.change_milestone', 'projectapp.delete_milestone',
+            ),
         })
         return context
 
@@ -228,7 +250,9 @@ class TaskCreateView(LoginRequiredMixin, PermissionMixin, CreateView):
     permission_required = 'projectapp.add_task'
 
     def dispatch(self, request, *args, **kwargs):
-        self.project = get_object_or_404(Project, id=kwargs['project_id'])
+        # The form scopes its choices by the project's id and the page shows
+        # its title; the rest of the row is never read
+        self.project = get_object_or_404(Project.objects.only('id', 'title'), id=kwargs['project_id'])
         return super().dispatch(request, *args, **kwargs)
 
     def get_form_kwargs(self):
@@ -244,13 +268,9 @@ class TaskCreateView(LoginRequiredMixin, PermissionMixin, CreateView):
 
         new_tags_str = self.request.POST.get('new_tags', '').strip()
         if new_tags_str:
-            new_tags_list = [t.strip() for t in new_tags_str.split(',') if t.strip()]
-            
-            for tag_name in new_tags_list:
-                # Create the tag if it doesn't exist, linked to the project
-                tag, created = Tag.objects.get_or_create(name=tag_name, project=task.project)
-                # Assign the newly created/found tag to the task
-                task.tags.add(tag)
+            new_tags_list = Tag.parse_names(new_tags_str)
+            # Create the missing tags in the project and assign them all at once
+            task.tags.add(*Tag.get_or_create_many(task.project, new_tags_list))
 
         
         messages.success(self.request, f"Task '{task.title}' created successfully.")
@@ -258,11 +278,9 @@ class TaskCreateView(LoginRequiredMixin, PermissionMixin, CreateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        u = self.request.user
         context.update({
             'project': self.project,
-            'can_add_task': u.has_perm('projectapp.add_task'),
-            'can_change_task': u.has_perm('projectapp.change_task'),
+            **_perm_flags(self.request.user, 'projectapp.add_task', 'projectapp.change_task'),
         })
         return context
 
@@ -273,9 +291,13 @@ class TaskUpdateView(LoginRequiredMixin, PermissionMixin, UpdateView):
     template_name = 'projectapp/task_form.html'
     permission_required = 'projectapp.change_task'
 
+    def get_queryset(self):
+        # The form, the template and the redirect all use the task's project
+        return Task.objects.select_related('project')
+
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
-        kwargs['project'] = Project.objects.get(pk=self.object.project_id)
+        kwargs['project'] = self.object.project
         return kwargs
     
     def get_object(self, queryset=None):
@@ -285,36 +307,27 @@ class TaskUpdateView(LoginRequiredMixin, PermissionMixin, UpdateView):
         return obj
 
     def form_valid(self, form):
-        current_project = Project.objects.get(pk=self.object.project_id)
+        # project is not a form field, so the task keeps its project
         task = form.save(commit=False)
-        if not task.project_id: ###
-            task.project = current_project ###
         task.save()
         form.save_m2m()
         
         new_tags_str = self.request.POST.get('new_tags', '').strip()
         if new_tags_str:
-            new_tags_list = [t.strip() for t in new_tags_str.split(',') if t.strip()]
-            
-            for tag_name in new_tags_list:
-                # Get or create the tag, linked to the project (using task.project which is the existing project)
-                tag, created = Tag.objects.get_or_create(name=tag_name, project=task.project)
-                # Assign the newly created/found tag to the task
-                task.tags.add(tag)
+            new_tags_list = Tag.parse_names(new_tags_str)
+            # Create the missing tags in the task's project and assign them all at once
+            task.tags.add(*Tag.get_or_create_many(task.project, new_tags_list))
         
         
         messages.success(self.request, f"Task '{task.title}' updated successfully.")
-        return redirect('project_detail', pk=task.project.id)
+        return redirect('project_detail', pk=task.project_id)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        u = self.request.user
-        project = Project.objects.get(pk=self.object.project_id)
         context.update({
-            'project': project,
+            'project': self.object.project,
             'task': self.object,
-            'can_add_task': u.has_perm('projectapp.add_task'),
-            'can_change_task': u.has_perm('projectapp.change_task'),
+            **_perm_flags(self.request.user, 'projectapp.add_task', 'projectapp.change_task'),
         })
         return context
 
@@ -333,18 +346,22 @@ class TaskDetailView(DetailView):
     template_name = 'projectapp/task_detail.html'
     context_object_name = 'task'
 
+    def get_queryset(self):
+        # The template reads task.overdue; with_overdue() resolves today's
+        # date, so it must run per request
+        return Task.objects.with_overdue()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         task = self.object
-        task.overdue = task.is_overdue()
-        u = self.request.user
+        flags = _perm_flags(self.request.user, 'projectapp.change_task', 'projectapp.delete_task')
         
         dependents_qs = task.dependents.all().select_related('project', 'milestone').order_by('due_date', '-priority')
         
         context.update({
             'project': task.project,
-            'can_edit_task': u.has_perm('projectapp.change_task'),
-            'can_delete_task': u.has_perm('projectapp.delete_task'),
+            'can_edit_task': flags['can_change_task'],
+            'can_delete_task': flags['can_delete_task'],
             'dependents': dependents_qs,
         })
         return context
@@ -358,7 +375,8 @@ class MilestoneCreateView(LoginRequiredMixin, PermissionMixin, CreateView):
     permission_required = 'projectapp.add_milestone' 
 
     def dispatch(self, request, *args, **kwargs):
-        self.project = get_object_or_404(Project, id=kwargs['project_id'])
+        # Only the project's id and title are used, by the form and the page
+        self.project = get_object_or_404(Project.objects.only('id', 'title'), id=kwargs['project_id'])
         return super().dispatch(request, *args, **kwargs)
 
     def get_form_kwargs(self):
@@ -381,7 +399,7 @@ class MilestoneCreateView(LoginRequiredMixin, PermissionMixin, CreateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['project'] = self.project
-        context['can_add_milestone'] = self.request.user.has_perm(self.permission_required)
+        context.update(_perm_flags(self.request.user, 'projectapp.add_milestone'))
         return context
     
 class MilestoneUpdateView(LoginRequiredMixin, PermissionMixin, UpdateView):
@@ -398,8 +416,9 @@ class MilestoneUpdateView(LoginRequiredMixin, PermissionMixin, UpdateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['project'] = self.object.project
-        context['can_delete_milestone'] = self.request.user.has_perm('projectapp.delete_milestone')
-        context['can_change_milestone'] = self.request.user.has_perm(self.permission_required)
+        context.update(_perm_flags(
+            self.request.user, 'projectapp.delete_milestone', 'projectapp.change_milestone',
+        ))
         return context
     
     def form_valid(self, form):
@@ -442,7 +461,7 @@ class MilestoneDeleteView(LoginRequiredMixin, PermissionMixin, DeleteView):
         context['object_type'] = 'Milestone'
         # Pass parent object ID for the cancel link in confirm_delete.html
         context['parent_object_id'] = self.object.project.id 
-        context['can_delete_milestone'] = self.request.user.has_perm(self.permission_required)
+        context.update(_perm_flags(self.request.user, 'projectapp.delete_milestone'))
         return context
     
 class MilestoneDetailView(DetailView):
@@ -454,6 +473,14 @@ class MilestoneDetailView(DetailView):
     template_name = 'projectapp/milestone_detail.html'
     context_object_name = 'milestone'
 
+    def get_queryset(self):
+        # The template reads is_complete and latest_due_date (twice), so load them with the row
+        return (
+            Milestone.objects.select_related('project')
+            .with_open_tasks()
+            .with_latest_due()
+        )
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         milestone = self.object
@@ -463,14 +490,13 @@ class MilestoneDetailView(DetailView):
             # Tasks linked via the related_name 'tasks' on the Milestone model
             'tasks': milestone.tasks.all().select_related('milestone').order_by('due_date'),
             
-            # Permission Checks (following the pattern used in ProjectDetailView)
-            'can_view_milestone': u.has_perm('projectapp.view_milestone'), # Good practice
-            'can_change_milestone': u.has_perm('projectapp.change_milestone'),
-            'can_delete_milestone': u.has_perm('projectapp.delete_milestone'),
-            
-            # Additional context for linked tasks
-            'can_add_task': u.has_perm('projectapp.add_task'),
-            'can_change_task': u.has_perm('projectapp.change_task'),
+            # Permission Checks (following the pattern used in ProjectDetailView),
+            # plus the linked task actions
+            **_perm_flags(
+                u,
+                'projectapp.view_milestone', 'projectapp.change_milestone', 'projectapp.delete_milestone',
+                'projectapp.add_task', 'projectapp.change_task',
+            ),
             
             # Pass the project object itself
             'project': milestone.project,
@@ -480,95 +506,126 @@ class MilestoneDetailView(DetailView):
 # ---------- OTHER FUNCTIONAL VIEWS ----------
 
 def project_board(request, pk):
-    project = get_object_or_404(Project, pk=pk)
-
-    all_tasks = project.tasks.all().select_related('milestone')
-
-    tasks = {
-        'todo': all_tasks.filter(status='todo').order_by('priority', 'due_date'),
-        'in_progress': all_tasks.filter(status='in_progress').order_by('priority', 'due_date'),
-        'done': all_tasks.filter(status='done').order_by('-updated_at'),
-    }
-
-    can_edit = request.user.has_perm('projectapp.change_task')
-    can_add_milestone = request.user.has_perm('projectapp.add_milestone')
+    # The header shows progress; milestone cards show completion, a task
+    # count and the task titles
+    project = get_object_or_404(
+        Project.objects.with_progress().prefetch_related(
+            Prefetch('milestones', queryset=Milestone.objects.with_open_tasks().prefetch_related('tasks')),
+        ),
+        pk=pk,
+    )
+
+    # One query for the whole board, split into columns in Python; the cards
+    # print a few columns and the done column sorts on updated_at
+    tasks = {'todo': [], 'in_progress': [], 'done': []}
+    board_tasks = project.tasks.only(
+        'id', 'project_id', 'title', 'priority', 'status', 'due_date', 'updated_at'
+    ).order_by('priority', 'due_date')
+    for task in board_tasks:
+        if task.status in tasks:
+            tasks[task.status].append(task)
+    tasks['done'].sort(key=attrgetter('updated_at'), reverse=True)
+
+    flags = _perm_flags(request.user, 'projectapp.change_task', 'projectapp.add_milestone')
 
     return render(request, 'projectapp/project_board.html', {
         'project': project,
         'tasks': tasks,
-        'can_edit': can_edit,
-        'can_add_milestone': can_add_milestone,
+        'can_edit': flags['can_change_task'],
+        'can_add_milestone': flags['can_add_milestone'],
     })
 
+def _json_response(data, status=200):
+    """Encodes small JSON replies with orjson, as the API's renderer does."""
+    return HttpResponse(orjson.dumps(data), status=status, content_type='application/json')
+
+
 #@login_required
 def task_move(request):
     if request.method == 'POST':
-        data = json.loads(request.body)
+        try:
+            data = orjson.loads(request.body)
+        except orjson.JSONDecodeError:
+            return _json_response({'success': False}, status=400)
         task_id = data.get('task_id')
         new_status = data.get('status')
 
-        task = get_object_or_404(Task, id=task_id)
         if not request.user.has_perm('projectapp.change_task'):
-            return JsonResponse({'success': False}, status=403) # Forbidden
-        if new_status in ['todo', 'in_progress', 'done']:
-            task.status = new_status
-            task.save()
-            return JsonResponse({'success': True})
-    return JsonResponse({'success': False}, status=400)
+            return _json_response({'success': False}, status=403) # Forbidden
+        if new_status in {Task.TODO, Task.IN_PROGRESS, Task.DONE}:
+            # A status change moves no milestone date, so the row is updated
+            # in place: one single-column UPDATE, no SELECT and no full save()
+            updated = Task.objects.filter(id=task_id).update(status=new_status, updated_at=timezone.now())
+            if not updated:
+                return _json_response({'success': False}, status=404)
+            return _json_response({'success': True, 'status': new_status})
+    return _json_response({'success': False}, status=400)
 
 
 def search(request):
     query = request.GET.get('search')
     sort_by = request.GET.get('sort', 'title')
 
-    project_results = Project.objects.all()
-    task_results = Task.objects.all()
-    milestone_results = Milestone.objects.all()
+    # Each result prints its title and description; milestones add their
+    # due date and their project's title
+    project_results = Project.objects.only('id', 'title', 'description')
+    task_results = Task.objects.only('id', 'title', 'description')
+    milestone_results = Milestone.objects.select_related('project').only(
+        'id', 'name', 'description', 'due_date', 'project__title'
+    )
 
     if query:        
+        # The filters only touch columns of each base table, so no join can
+        # repeat a row and the results need no distinct()
         title_description_filter = Q(title__icontains=query) | Q(description__icontains=query)
         
-        project_results = project_results.filter(title_description_filter).distinct()
-        task_results = task_results.filter(title_description_filter).distinct()
+        project_results = project_results.filter(title_description_filter)
+        task_results = task_results.filter(title_description_filter)
         
         milestone_filter = Q(name__icontains=query) | Q(description__icontains=query)
-        milestone_results = milestone_results.filter(milestone_filter).distinct()
+        milestone_results = milestone_results.filter(milestone_filter)
 
+    # Projects sort on an aggregate of their tasks, which keeps one row per project
     if sort_by == 'priority':
-        project_results = project_results.order_by('tasks__priority')
-        task_results = task_results.order_by('priority')
+        project_results = project_results.annotate(min_prio=Min('tasks__priority')).order_by('min_prio', 'title')
+        task_results = task_results.order_by('priority', 'id')
     elif sort_by == 'due_date':
-        project_results = project_results.order_by('tasks__due_date')
-        task_results = task_results.order_by('due_date')
+        project_results = project_results.annotate(first_due=Min('tasks__due_date')).order_by('first_due', 'title')
+        task_results = task_results.order_by('due_date', 'id')
     if sort_by == 'due_date':
-        milestone_results = milestone_results.order_by('due_date')
+        milestone_results = milestone_results.order_by('due_date', 'id')
     else: # Default or 'title' sort for Milestones
-        milestone_results = milestone_results.order_by('name')
+        milestone_results = milestone_results.order_by('name', 'id')
         
+    # Each list is paged on its own parameter, so paging through one list
+    # leaves the others where they are. A page is a list evaluated once,
+    # so the template's emptiness checks and loops share one query.
+    def page_of(results, param):
+        return Paginator(results, 25).get_page(request.GET.get(param))
+
     u = request.user
     context = {
-        'project_results': project_results,
-        'task_results': task_results,
-        'milestone_results': milestone_results,
+        'project_results': page_of(project_results, 'project_page'),
+        'task_results': page_of(task_results, 'task_page'),
+        'milestone_results': page_of(milestone_results, 'milestone_page'),
         'sort_by': sort_by,
         'query': query,
-        'can_add_task': u.has_perm('projectapp.add_task'),
-        'can_change_task': u.has_perm('projectapp.change_task'),
-        'can_delete_task': u.has_perm('projectapp.delete_task'),
-        'can_change_project': u.has_perm('projectapp.change_project'),
-        'can_delete_project': u.has_perm('projectapp.delete_project'),
-        'can_add_milestone': u.has_perm('projectapp.add_milestone'),
-        'can_change_milestone': u.has_perm('projectapp.change_milestone'),
-        'can_delete_milestone': u.has_perm('projectapp.delete_milestone'),
+        **_perm_flags(
+            u,
+            'projectapp.add_task', 'projectapp.change_task', 'projectapp.delete_task',
+            'projectapp.change_project', 'projectapp.delete_project',
+            'projectapp.add_milestone', 'projectapp.change_milestone', 'projectapp.delete_milestone',
+        ),
     }
     return render(request, 'projectapp/search_results.html', context)
 
 
 def tasks_by_tag(request, id, tag_id):
     project = get_object_or_404(Project, id=id)
-    tasks = project.tasks.filter(tags__id=tag_id).distinct()
-    for task in tasks:
-        task.overdue = task.is_overdue()
+    # A semi-join on the tag table: each task appears once, with no join to
+    # de-duplicate, and the lookup uses the (task, tag) unique index
+    tagged = Task.tags.through.objects.filter(task_id=OuterRef('pk'), tag_id=tag_id)
+    tasks = project.tasks.filter(Exists(tagged)).with_overdue()
     return render(request, 'projectapp/tasks_by_tag.html', {
         'project': project,
         'tasks': tasks,
@@ -72,6 +72,11 @@ REST_FRAMEWORK = {
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication', 
     ],
+    # orjson encodes straight to bytes; keep the browsable API for manual testing
+    'DEFAULT_RENDERER_CLASSES': [
+        'projectapp.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     
      # Add support for throttling 
     'DEFAULT_THROTTLE_CLASSES': [
@@ -129,6 +134,10 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Reuse each worker's connection across requests instead of opening
+        # the database file per request; a broken connection is replaced
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", "600")),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
@@ -0,0 +1,22 @@
+"""
+Settings for running the test suite.
+
+    python manage.py test projectapp --settings=projmngt.test_settings --parallel=auto
+"""
+import os
+
+# Tests need no real secret; settings.py requires one to import
+os.environ.setdefault("DJANGO_SECRET_KEY", "test-only-secret-key")
+
+from .settings import *  # noqa: E402,F401,F403
+
+# Each test worker gets its own in-memory database
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    }
+}
+
+# Fixture users do not need a slow hash
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]